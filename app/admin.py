@@ -2,27 +2,53 @@
 # Jinja2-based administration panel for managing PDF papers
 
 from fastapi import APIRouter, Request, Form, HTTPException, Depends, status, BackgroundTasks
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+from functools import lru_cache
 import os
+import re
+import time
+import hashlib
+import threading
+import itertools
+import asyncio
 import logging
+import psutil
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from models import Paper, Metadata, Embedding, LayoutAnalysis, AdminUser, PageEmbedding
+from models import (Paper, Metadata, Embedding, LayoutAnalysis, AdminUser, PageEmbedding, ProcessingJob,
+                    PAPER_PENDING_CONDITION, serialize_vector_int8, deserialize_vector)
 from auth import AuthManager
 from db import get_paper_by_id, get_page_embeddings_by_id, db
 from vector_db import get_vector_db
 from duplicate_detector import get_duplicate_detector
 from service_circuit_breaker import get_circuit_breaker_manager
+from backup import get_backup_manager, get_chromadb_backup_manager, get_unified_backup_manager
+from consistency_check import get_consistency_checker, ConsistencyIssueType
+from file_security import get_security_status, get_file_validator, get_settings_store
 from version import get_version
-from peewee import JOIN
+from ocr import (extract_page_texts_from_pdf, perform_page_ocr_with_tesseract,
+                 detect_language_hybrid, regenerate_pdf_text_layer, extract_first_pages_with_formatting)
+from embedding import generate_text_embedding, generate_page_embeddings
+from metadata import extract_paper_metadata
+from peewee import JOIN, SQL, chunked, fn, Case
 import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Version is fixed for the lifetime of the process
+APP_VERSION = get_version()
+
+# Prime psutil so later cpu_percent(interval=None) calls return the
+# utilisation since the previous call without blocking
+psutil.cpu_percent(interval=None)
+
 # Initialize router and templates
 router = APIRouter(prefix="/admin", tags=["admin"])
 templates = Jinja2Templates(directory="templates")
@@ -34,16 +60,52 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    """Create JWT access token"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+def create_access_token(sub: str, ttl: int = ACCESS_TOKEN_EXPIRE_MINUTES * 60) -> str:
+    """Create JWT access token for subject, valid for ttl seconds"""
+    return jwt.encode({"sub": sub, "exp": int(time.time()) + ttl}, SECRET_KEY, algorithm=ALGORITHM)
+
+
+# Admin user lookups are cached for up to this many seconds
+USER_CACHE_SECONDS = 30
+
+
+def _decode(token: str) -> Optional[str]:
+    """Decode JWT token and return its username, or None if invalid"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+_USER_CACHE: Dict[str, tuple] = {}
+
+
+def _get_user(username: Optional[str]) -> Optional[AdminUser]:
+    """Get admin user by username, reusing a lookup for up to USER_CACHE_SECONDS"""
+    if not username:
+        return None
+    now = time.monotonic()
+    cached = _USER_CACHE.get(username)
+    if cached is not None and now - cached[0] < USER_CACHE_SECONDS:
+        return cached[1]
+    
+    user = AdminUser.get_or_none(AdminUser.username == username)
+    _USER_CACHE[username] = (now, user)
+    return user
+
+
+def _invalidate_user_cache(username: str):
+    """Drop a cached user after its account changes"""
+    _USER_CACHE.pop(username, None)
+
+
+def _bearer_token(request: Request) -> Optional[str]:
+    """Extract bearer token from the Authorization header"""
+    auth_header = request.headers.get("authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header.split(" ")[1]
+    return None
 
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Optional[AdminUser]:
@@ -51,49 +113,28 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
     if not credentials:
         return None
     
-    try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        
-        user = AdminUser.get_or_none(AdminUser.username == username)
-        return user
-    except JWTError:
-        return None
+    return _get_user(_decode(credentials.credentials))
 
 
 def get_current_user(request: Request) -> Optional[AdminUser]:
     """Get current user from session or token"""
-    # Check for token in Authorization header
-    auth_header = request.headers.get("authorization")
-    if auth_header and auth_header.startswith("Bearer "):
-        token = auth_header.split(" ")[1]
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            username = payload.get("sub")
-            if username:
-                return AdminUser.get_or_none(AdminUser.username == username)
-        except JWTError:
-            pass
-    
-    # Check session cookie
-    token = request.cookies.get("access_token")
-    if token:
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            username = payload.get("sub")
-            if username:
-                return AdminUser.get_or_none(AdminUser.username == username)
-        except JWTError:
-            pass
+    # Prefer token in Authorization header, then session cookie
+    for token in (_bearer_token(request), request.cookies.get("access_token")):
+        if token:
+            user = _get_user(_decode(token))
+            if user:
+                return user
     
     return None
 
 
 def require_auth(request: Request) -> AdminUser:
     """Require authentication for admin routes"""
-    user = get_current_user(request)
+    # Reuse the user resolved earlier in this request, if any
+    user = getattr(request.state, "user", None)
+    if user is None:
+        user = get_current_user(request)
+        request.state.user = user
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -103,31 +144,32 @@ def require_auth(request: Request) -> AdminUser:
     return user
 
 
+# Dashboard counts: total papers, papers with metadata/embedding/layout/page
+# embeddings, and total page embeddings
+STATS_COUNTS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM paper),
+        (SELECT COUNT(DISTINCT paper_id) FROM metadata),
+        (SELECT COUNT(DISTINCT paper_id) FROM embedding),
+        (SELECT COUNT(DISTINCT paper_id) FROM layoutanalysis),
+        (SELECT COUNT(DISTINCT paper_id) FROM pageembedding),
+        (SELECT COUNT(*) FROM pageembedding)
+"""
+
+
 def get_stats() -> Dict[str, Any]:
     """Get dashboard statistics"""
     try:
-        # Use simpler counting approach to avoid SQL issues
-        total_papers = Paper.select().count()
-        logger.info(f"get_stats: Total papers = {total_papers}")
-        
-        # Count papers with each type of data
-        papers_with_metadata = 0
-        papers_with_embeddings = 0 
-        papers_with_layout = 0
-        papers_with_page_embeddings = 0
-        
-        for paper in Paper.select():
-            if Metadata.select().where(Metadata.paper == paper).exists():
-                papers_with_metadata += 1
-            if Embedding.select().where(Embedding.paper == paper).exists():
-                papers_with_embeddings += 1
-            if LayoutAnalysis.select().where(LayoutAnalysis.paper == paper).exists():
-                papers_with_layout += 1
-            if PageEmbedding.select().where(PageEmbedding.paper == paper).exists():
-                papers_with_page_embeddings += 1
-        
-        # Get total page embeddings count
-        total_page_embeddings = PageEmbedding.select().count()
+        # Collect all counts in a single round-trip
+        cursor = db.execute_sql(STATS_COUNTS_SQL)
+        (total_papers,
+         papers_with_metadata,
+         papers_with_embeddings,
+         papers_with_layout,
+         papers_with_page_embeddings,
+         total_page_embeddings) = cursor.fetchone()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"get_stats: Total papers = {total_papers}")
         
         # Calculate processing rates
         metadata_rate = (papers_with_metadata / total_papers * 100) if total_papers > 0 else 0
@@ -182,6 +224,80 @@ def get_stats() -> Dict[str, Any]:
         }
 
 
+# Dashboard statistics cache (counts change on the order of minutes)
+STATS_CACHE_TTL = 60
+_STATS_CACHE = {"at": 0.0, "value": None}
+
+
+def _cached_stats(ttl: int = STATS_CACHE_TTL) -> Dict[str, Any]:
+    """Get dashboard statistics, reusing the cached result for up to ttl seconds"""
+    now = time.monotonic()
+    if _STATS_CACHE["value"] is not None and now - _STATS_CACHE["at"] < ttl:
+        return _STATS_CACHE["value"]
+    
+    stats = get_stats()
+    _STATS_CACHE.update(at=now, value=stats)
+    return stats
+
+
+def refresh_admin_stats() -> Dict[str, Any]:
+    """Recompute dashboard statistics and store them in the cache (background task)"""
+    stats = get_stats()
+    _STATS_CACHE.update(at=time.monotonic(), value=stats)
+    return stats
+
+
+def invalidate_stats_cache():
+    """Drop cached dashboard statistics after data changes"""
+    _STATS_CACHE["value"] = None
+
+
+# Short-lived caches for dashboard polling endpoints, keyed by name
+POLL_CACHE_TTL = 5
+_POLL_CACHE: Dict[str, tuple] = {}
+
+
+def _poll_cached(key: str, compute, ttl: int = POLL_CACHE_TTL):
+    """Return compute() result, reusing the cached value for up to ttl seconds"""
+    now = time.monotonic()
+    cached = _POLL_CACHE.get(key)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+    
+    value = compute()
+    _POLL_CACHE[key] = (now, value)
+    return value
+
+
+def _invalidate_poll_cache(key: str):
+    """Drop a cached polling result after the underlying state changes"""
+    _POLL_CACHE.pop(key, None)
+
+
+# GPU status shells out to nvidia-smi and queries Ollama; concurrent polls
+# share one probe, run off the event loop
+GPU_STATUS_TTL = 1.5
+_GPU_STATUS_CACHE = {"at": 0.0, "value": None}
+_GPU_STATUS_LOCK = asyncio.Lock()
+
+
+async def _gpu_status_cached() -> Dict[str, Any]:
+    """Return the comprehensive GPU status, probing at most once per GPU_STATUS_TTL"""
+    async with _GPU_STATUS_LOCK:
+        if (_GPU_STATUS_CACHE["value"] is None
+                or time.monotonic() - _GPU_STATUS_CACHE["at"] >= GPU_STATUS_TTL):
+            from gpu_monitor import get_gpu_monitor
+            _GPU_STATUS_CACHE["value"] = await asyncio.to_thread(get_gpu_monitor().get_comprehensive_status)
+            _GPU_STATUS_CACHE["at"] = time.monotonic()
+        return _GPU_STATUS_CACHE["value"]
+
+
+# bcrypt checks run in worker threads; this caps how many run at once so a
+# burst of login attempts cannot occupy every core
+LOGIN_CONCURRENCY = int(os.getenv("ADMIN_LOGIN_CONCURRENCY", "4"))
+_LOGIN_SEMAPHORE = asyncio.Semaphore(LOGIN_CONCURRENCY)
+
+
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
     """Admin login page"""
@@ -197,7 +313,8 @@ async def login_page(request: Request):
 async def login(request: Request, username: str = Form(...), password: str = Form(...)):
     """Process admin login"""
     try:
-        user = AuthManager.authenticate_user(username, password)
+        async with _LOGIN_SEMAPHORE:
+            user = await asyncio.to_thread(AuthManager.authenticate_user, username, password)
         if not user:
             return templates.TemplateResponse(
                 "login.html", 
@@ -205,10 +322,7 @@ async def login(request: Request, username: str = Form(...), password: str = For
             )
         
         # Create access token
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
-        )
+        access_token = create_access_token(user.username)
         
         # Redirect to dashboard with cookie
         response = RedirectResponse(url="/admin/dashboard", status_code=302)
@@ -239,7 +353,7 @@ async def logout():
 async def dashboard(request: Request):
     """Admin dashboard"""
     user = require_auth(request)
-    stats = get_stats()
+    stats = _cached_stats()
     
     return templates.TemplateResponse(
         "dashboard.html", 
@@ -251,58 +365,90 @@ async def dashboard(request: Request):
     )
 
 
+def _paper_cursor(paper) -> str:
+    """Keyset cursor for a paper row in the newest-first papers list"""
+    return f"{paper.created_at.isoformat()}|{paper.doc_id}"
+
+
+def _parse_paper_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """Parse a papers-list cursor into (created_at, doc_id), or None if invalid"""
+    if not cursor:
+        return None
+    created_at, _, doc_id = cursor.partition("|")
+    try:
+        return datetime.fromisoformat(created_at), doc_id
+    except ValueError:
+        return None
+
+
 @router.get("/papers", response_class=HTMLResponse)
-async def papers_list(request: Request, search: Optional[str] = None):
+async def papers_list(request: Request, search: Optional[str] = None, page: int = 1, per_page: int = 50,
+                      after: Optional[str] = None, before: Optional[str] = None):
     """Papers management page"""
     user = require_auth(request)
     
     try:
-        # Get papers with optional search
+        # Get papers with metadata in a single query (LEFT JOIN avoids N+1 lookups)
+        papers = (Paper
+                 .select(Paper, Metadata)
+                 .join(Metadata, JOIN.LEFT_OUTER, attr='metadata_record')
+                 .order_by(Paper.created_at.desc(), Paper.doc_id.desc()))
         if search:
-            papers = (Paper
-                     .select()
-                     .where(Paper.filename.contains(search))
-                     .order_by(Paper.created_at.desc()))
+            # Prefix match (LIKE 'term%') can use the filename index
+            papers = papers.where(Paper.filename.startswith(search))
+            total = papers.count()
         else:
-            papers = Paper.select().order_by(Paper.created_at.desc())
-        
-        # Debug database connection
-        logger.info(f"Database closed: {db.is_closed()}")
-        if db.is_closed():
-            db.connect()
-            logger.info("Reconnected to database")
-            
-        # Count papers directly
-        direct_count = Paper.select().count()
-        query_count = papers.count()
-        
-        logger.info(f"Papers page: Direct count = {direct_count}, Query count = {query_count}")
-        
-        # List all papers for debugging
-        all_papers = list(Paper.select())
-        logger.info(f"All papers in DB: {[p.doc_id for p in all_papers]}")
+            total = _cached_stats()["total_papers"]
+        
+        page = max(page, 1)
+        per_page = min(max(per_page, 1), 200)
+        total_pages = max((total + per_page - 1) // per_page, 1)
+        
+        # Prev/next links carry the boundary row (keyset pagination), so deep
+        # pages seek in the created_at index instead of skipping OFFSET rows;
+        # a bare ?page= still falls back to OFFSET
+        after_key = _parse_paper_cursor(after)
+        before_key = _parse_paper_cursor(before)
+        if after_key:
+            created_at, doc_id = after_key
+            papers = (papers
+                      .where((Paper.created_at < created_at) |
+                             ((Paper.created_at == created_at) & (Paper.doc_id < doc_id)))
+                      .limit(per_page))
+        elif before_key:
+            created_at, doc_id = before_key
+            papers = (papers
+                      .where((Paper.created_at > created_at) |
+                             ((Paper.created_at == created_at) & (Paper.doc_id > doc_id)))
+                      .order_by(Paper.created_at.asc(), Paper.doc_id.asc())
+                      .limit(per_page))
+        else:
+            papers = papers.paginate(page, per_page)
         
-        # Convert to list and add metadata
+        # Convert to list and attach joined metadata
         papers_list = []
-        for paper in papers:
-            try:
-                metadata = Metadata.get_or_none(Metadata.paper == paper)
-                paper.metadata = metadata
-                papers_list.append(paper)
-                logger.info(f"Added paper {paper.doc_id} to list")
-            except Exception as e:
-                logger.error(f"Error processing paper {paper.doc_id}: {e}")
-                paper.metadata = None
-                papers_list.append(paper)
+        for paper in papers.iterator():
+            paper.metadata = getattr(paper, 'metadata_record', None)
+            papers_list.append(paper)
+        if before_key:
+            papers_list.reverse()
         
-        logger.info(f"Final papers_list length: {len(papers_list)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Final papers_list length: {len(papers_list)}")
         
         return templates.TemplateResponse(
             "papers.html", 
             {
                 "request": request, 
                 "user": user, 
-                "papers": papers_list
+                "papers": papers_list,
+                "search": search or "",
+                "page": page,
+                "per_page": per_page,
+                "total": total,
+                "total_pages": total_pages,
+                "prev_cursor": _paper_cursor(papers_list[0]) if papers_list else None,
+                "next_cursor": _paper_cursor(papers_list[-1]) if papers_list else None
             }
         )
         
@@ -329,11 +475,22 @@ async def paper_detail(request: Request, doc_id: str):
         if not paper:
             raise HTTPException(status_code=404, detail="Paper not found")
         
-        # Get associated data
+        # Get associated data; vector blobs and layout JSON are not shown, so
+        # only the displayed columns are selected
         metadata = Metadata.get_or_none(Metadata.paper == paper)
-        embedding = Embedding.get_or_none(Embedding.paper == paper)
-        layout = LayoutAnalysis.get_or_none(LayoutAnalysis.paper == paper)
-        page_embeddings = list(PageEmbedding.select().where(PageEmbedding.paper == paper))
+        embedding = (Embedding
+                     .select(Embedding.model_name, Embedding.vector_dim, Embedding.created_at)
+                     .where(Embedding.paper == paper)
+                     .first())
+        layout = (LayoutAnalysis
+                  .select(LayoutAnalysis.page_count, LayoutAnalysis.created_at)
+                  .where(LayoutAnalysis.paper == paper)
+                  .first())
+        page_embeddings = list(PageEmbedding
+                               .select(PageEmbedding.page_number, PageEmbedding.page_text,
+                                       PageEmbedding.model_name, PageEmbedding.vector_dim)
+                               .where(PageEmbedding.paper == paper)
+                               .order_by(PageEmbedding.page_number))
         
         return templates.TemplateResponse(
             "paper_detail.html", 
@@ -364,14 +521,14 @@ async def delete_paper_post(request: Request, doc_id: str):
         if not paper:
             return RedirectResponse(url="/admin/papers?error=Paper not found", status_code=302)
         
-        # Delete associated records
-        PageEmbedding.delete().where(PageEmbedding.paper == paper).execute()
-        Embedding.delete().where(Embedding.paper == paper).execute()
-        Metadata.delete().where(Metadata.paper == paper).execute()
-        LayoutAnalysis.delete().where(LayoutAnalysis.paper == paper).execute()
+        # Delete paper; associated records are removed by ON DELETE CASCADE
+        # (foreign_keys pragma is enabled) within the same transaction
+        with db.atomic():
+            paper.delete_instance()
+        invalidate_stats_cache()
         
-        # Delete paper
-        paper.delete_instance()
+        # Rendered page images would otherwise outlive the paper
+        await asyncio.to_thread(_remove_page_image_cache, doc_id)
         
         return RedirectResponse(url="/admin/papers?message=Paper deleted successfully", status_code=302)
             
@@ -427,9 +584,14 @@ async def change_password_post(
     
     try:
         # Change password using AuthManager
-        success = AuthManager.change_password(user.username, current_password, new_password)
+        async with _LOGIN_SEMAPHORE:
+            success = await asyncio.to_thread(
+                AuthManager.change_password, user.username, current_password, new_password
+            )
         
         if success:
+            _invalidate_user_cache(user.username)
+            
             # Log out user for security (they need to login with new password)
             response = RedirectResponse(url="/admin/login?message=Password changed successfully. Please login with your new password.", status_code=302)
             response.delete_cookie(key="access_token")
@@ -480,25 +642,18 @@ async def vector_db_monitoring(request: Request):
     user = require_auth(request)
     
     try:
-        # Get ChromaDB statistics
+        # Get ChromaDB statistics and health concurrently
         vector_db = get_vector_db()
-        chroma_stats = vector_db.get_collection_stats()
-        chroma_health = vector_db.health_check()
-        
-        # Get SQLite paper counts for comparison
-        total_papers = Paper.select().count()
-        
-        # Count papers with embeddings using distinct
-        papers_with_embeddings = (Embedding
-                                .select(Embedding.paper)
-                                .distinct()
-                                .count())
+        chroma_stats, chroma_health = await asyncio.gather(
+            asyncio.to_thread(vector_db.get_collection_stats),
+            asyncio.to_thread(vector_db.health_check)
+        )
         
-        # Count papers with page embeddings using distinct
-        papers_with_page_embeddings = (PageEmbedding
-                                     .select(PageEmbedding.paper)
-                                     .distinct()
-                                     .count())
+        # SQLite counts for comparison come from the cached stats snapshot
+        stats = _cached_stats()
+        total_papers = stats["total_papers"]
+        papers_with_embeddings = stats["papers_with_embeddings"]
+        papers_with_page_embeddings = stats["papers_with_page_embeddings"]
         
         # Calculate coverage percentages
         embedding_coverage = (chroma_stats['papers_count'] / total_papers * 100) if total_papers > 0 else 0
@@ -530,7 +685,7 @@ async def vector_db_monitoring(request: Request):
                 "request": request, 
                 "user": user,
                 "dashboard_data": dashboard_data,
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
         
@@ -541,7 +696,7 @@ async def vector_db_monitoring(request: Request):
                 "request": request, 
                 "user": user,
                 "error": f"Error loading ChromaDB statistics: {str(e)}",
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
 
@@ -639,12 +794,10 @@ async def system_monitoring(request: Request):
         return RedirectResponse(url="/admin/login", status_code=302)
     
     try:
-        import psutil
-        import time
         from performance_monitor import get_performance_monitor
         
-        # Get current system metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Get current system metrics (non-blocking: CPU usage since last call)
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
         
@@ -741,7 +894,7 @@ async def duplicate_prevention_monitoring(request: Request):
                               .limit(10))
         
         # Calculate efficiency metrics
-        total_papers = Paper.select().count()
+        total_papers = _cached_stats()["total_papers"]
         hash_coverage = {
             'file_hash_coverage': (dup_stats['file_hashes_count'] / total_papers * 100) if total_papers > 0 else 0,
             'content_hash_coverage': (dup_stats['content_hashes_count'] / total_papers * 100) if total_papers > 0 else 0,
@@ -755,9 +908,9 @@ async def duplicate_prevention_monitoring(request: Request):
             'coverage': hash_coverage,
             'total_papers': total_papers,
             'recent_hashes': {
-                'file_hashes': list(recent_file_hashes),
-                'content_hashes': list(recent_content_hashes),
-                'sample_hashes': list(recent_sample_hashes)
+                'file_hashes': recent_file_hashes.iterator(),
+                'content_hashes': recent_content_hashes.iterator(),
+                'sample_hashes': recent_sample_hashes.iterator()
             }
         }
         
@@ -767,7 +920,7 @@ async def duplicate_prevention_monitoring(request: Request):
                 "request": request,
                 "user": user,
                 "dashboard_data": dashboard_data,
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
         
@@ -778,7 +931,7 @@ async def duplicate_prevention_monitoring(request: Request):
                 "request": request,
                 "user": user,
                 "error": f"Error loading duplicate prevention statistics: {str(e)}",
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
 
@@ -814,7 +967,7 @@ async def scheduler_management(request: Request):
                 "request": request,
                 "user": user,
                 "dashboard_data": dashboard_data,
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
         
@@ -825,11 +978,95 @@ async def scheduler_management(request: Request):
                 "request": request,
                 "user": user,
                 "error": f"Error loading scheduler management: {str(e)}",
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
 
 # Backup management endpoints
+CHROMADB_BACKUP_SUBDIRS = ("daily", "weekly", "snapshots")
+BACKUP_SCAN_TTL = 30
+
+
+@lru_cache(maxsize=8)
+def _scan_tar_dir_cached(root: str, mtime_ns: int, bucket: int) -> Tuple[int, int]:
+    """Count and sum sizes of *.tar* archives in root; cache key includes dir mtime and TTL bucket"""
+    count = 0
+    size = 0
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if ".tar" in entry.name and entry.is_file(follow_symlinks=False):
+                count += 1
+                size += entry.stat(follow_symlinks=False).st_size
+    return count, size
+
+
+def _scan_tar_dir(root: str) -> Tuple[int, int]:
+    """Get (count, total size) of backup archives in root, or (0, 0) if it does not exist"""
+    try:
+        mtime_ns = os.stat(root).st_mtime_ns
+    except FileNotFoundError:
+        return 0, 0
+    return _scan_tar_dir_cached(root, mtime_ns, int(time.time() // BACKUP_SCAN_TTL))
+
+
+@lru_cache(maxsize=4)
+def _free_disk_bytes_cached(path: str, bucket: int) -> int:
+    """Free bytes available to unprivileged users on the filesystem holding path"""
+    st = os.statvfs(path)
+    return st.f_bavail * st.f_frsize
+
+
+def _free_disk_bytes(path: str) -> int:
+    """Get free disk space for path, re-reading at most every BACKUP_SCAN_TTL seconds"""
+    return _free_disk_bytes_cached(path, int(time.time() // BACKUP_SCAN_TTL))
+
+
+def _chromadb_backup_summary(chromadb_manager) -> Dict[str, Any]:
+    """Summarise ChromaDB backup archives across all backup subdirectories"""
+    backup_root = str(chromadb_manager.chromadb_backup_dir)
+    per_bucket = {}
+    for subdir in CHROMADB_BACKUP_SUBDIRS:
+        count, size = _scan_tar_dir(os.path.join(backup_root, subdir))
+        per_bucket[subdir] = {"count": count, "total_size": size}
+    return {
+        "count": sum(b["count"] for b in per_bucket.values()),
+        "total_size": sum(b["total_size"] for b in per_bucket.values()),
+        "per_bucket": per_bucket
+    }
+
+
+def _scan_chromadb_backups(chromadb_manager) -> Dict[str, Any]:
+    """Build ChromaDB section of the backup status"""
+    chromadb_summary = _chromadb_backup_summary(chromadb_manager)
+    return {
+        "directory_exists": chromadb_manager.chromadb_dir.exists(),
+        "backup_directory": str(chromadb_manager.chromadb_backup_dir),
+        "total_backups": chromadb_summary["count"],
+        "total_size_bytes": chromadb_summary["total_size"]
+    }
+
+
+async def _backup_status(sqlite_status: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build combined SQLite and ChromaDB backup status, gathering both concurrently"""
+    chromadb_manager = get_chromadb_backup_manager()
+    chromadb_task = asyncio.to_thread(_scan_chromadb_backups, chromadb_manager)
+    
+    # Get SQLite backup status unless the caller already has it
+    if sqlite_status is None:
+        sqlite_status, chromadb_status = await asyncio.gather(
+            asyncio.to_thread(get_backup_manager().get_backup_status),
+            chromadb_task
+        )
+    else:
+        chromadb_status = await chromadb_task
+    
+    return {
+        "sqlite": sqlite_status,
+        "chromadb": chromadb_status,
+        "unified_backup_available": True
+    }
+
+
 @router.post("/backup/trigger")
 async def trigger_backup(
     request: Request,
@@ -854,12 +1091,10 @@ async def trigger_backup(
         
         if unified:
             # Create unified backup (SQLite + ChromaDB)
-            from backup import get_unified_backup_manager
             backup_manager = get_unified_backup_manager()
             result = backup_manager.create_unified_backup(backup_type, options)
         else:
             # Create SQLite-only backup
-            from backup import get_backup_manager
             backup_manager = get_backup_manager()
             result = backup_manager.create_backup(backup_type, options)
         
@@ -874,42 +1109,7 @@ async def trigger_backup(
 async def get_backup_status(user: AdminUser = Depends(require_auth)):
     """Get current backup system status"""
     try:
-        from backup import get_backup_manager, get_chromadb_backup_manager
-        from pathlib import Path
-        
-        # Get SQLite backup status
-        sqlite_manager = get_backup_manager()
-        sqlite_status = sqlite_manager.get_backup_status()
-        
-        # Get ChromaDB backup status
-        chromadb_manager = get_chromadb_backup_manager()
-        chromadb_dir = chromadb_manager.chromadb_dir
-        chromadb_exists = chromadb_dir.exists()
-        
-        # Count ChromaDB backups
-        chromadb_backups = 0
-        chromadb_size = 0
-        if chromadb_manager.chromadb_backup_dir.exists():
-            for subdir in ["daily", "weekly", "snapshots"]:
-                backup_dir = chromadb_manager.chromadb_backup_dir / subdir
-                if backup_dir.exists():
-                    for backup_file in backup_dir.glob("*.tar*"):
-                        chromadb_backups += 1
-                        chromadb_size += backup_file.stat().st_size
-        
-        # Combined status
-        status = {
-            "sqlite": sqlite_status,
-            "chromadb": {
-                "directory_exists": chromadb_exists,
-                "backup_directory": str(chromadb_manager.chromadb_backup_dir),
-                "total_backups": chromadb_backups,
-                "total_size_bytes": chromadb_size
-            },
-            "unified_backup_available": True
-        }
-        
-        return status
+        return await _backup_status()
         
     except Exception as e:
         logger.error(f"Failed to get backup status: {e}")
@@ -919,16 +1119,15 @@ async def get_backup_status(user: AdminUser = Depends(require_auth)):
 @router.get("/backup/history")
 async def get_backup_history(
     limit: int = 50,
+    offset: int = 0,
     user: AdminUser = Depends(require_auth)
 ):
     """Get backup history"""
     try:
-        from backup import get_backup_manager
-        
         backup_manager = get_backup_manager()
-        history = backup_manager.get_backup_history(limit=limit)
+        history = list(itertools.islice(backup_manager.iter_backup_history(max(offset, 0)), max(limit, 0)))
         
-        return {"backups": history, "total": len(history)}
+        return {"backups": history, "total": backup_manager.history_count(), "offset": offset}
         
     except Exception as e:
         logger.error(f"Failed to get backup history: {e}")
@@ -947,8 +1146,6 @@ async def restore_backup(
         if not user.is_superuser:
             raise HTTPException(status_code=403, detail="Only superusers can restore backups")
         
-        from backup import get_backup_manager
-        
         backup_manager = get_backup_manager()
         result = backup_manager.restore_backup(backup_id, target_path)
         
@@ -965,13 +1162,10 @@ async def restore_backup(
 async def backup_management_page(request: Request, user: AdminUser = Depends(require_auth)):
     """Backup management dashboard page"""
     try:
-        # Get backup status using the same logic as the API endpoint
-        backup_status = await get_backup_status(user)
-        
-        # Get recent backups
-        from backup import get_backup_manager
-        backup_manager = get_backup_manager()
-        recent_backups = backup_manager.get_backup_history(limit=10)
+        # Get backup status and recent backups in one manager call
+        snapshot = await asyncio.to_thread(get_backup_manager().get_dashboard_snapshot, 10)
+        backup_status = await _backup_status(snapshot["status"])
+        recent_backups = snapshot["recent"]
         
         return templates.TemplateResponse(
             "backup_management.html",
@@ -980,7 +1174,7 @@ async def backup_management_page(request: Request, user: AdminUser = Depends(req
                 "user": user,
                 "backup_status": backup_status,
                 "recent_backups": recent_backups,
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
         
@@ -991,7 +1185,7 @@ async def backup_management_page(request: Request, user: AdminUser = Depends(req
                 "request": request,
                 "user": user,
                 "error": f"Error loading backup management: {str(e)}",
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
 
@@ -1000,12 +1194,10 @@ async def backup_management_page(request: Request, user: AdminUser = Depends(req
 async def run_backup_health_check(user: AdminUser = Depends(require_auth)):
     """Run manual backup health check"""
     try:
-        from backup import get_backup_manager
-        
         backup_manager = get_backup_manager()
         
-        # Run health check
-        backup_manager._backup_health_check()
+        # Run health check off the event loop
+        await asyncio.to_thread(backup_manager._backup_health_check)
         
         # Get current status
         status = backup_manager.get_backup_status()
@@ -1025,17 +1217,12 @@ async def run_backup_health_check(user: AdminUser = Depends(require_auth)):
 async def verify_backup_integrity(backup_id: str, user: AdminUser = Depends(require_auth)):
     """Verify the integrity of a specific backup"""
     try:
-        from backup import get_backup_manager
         from pathlib import Path
         
         backup_manager = get_backup_manager()
         
         # Find backup in history
-        backup_info = None
-        for backup in backup_manager.history:
-            if backup.get("backup_id") == backup_id:
-                backup_info = backup
-                break
+        backup_info = backup_manager.get_by_id(backup_id)
         
         if not backup_info:
             raise HTTPException(status_code=404, detail=f"Backup not found: {backup_id}")
@@ -1048,7 +1235,7 @@ async def verify_backup_integrity(backup_id: str, user: AdminUser = Depends(requ
             raise HTTPException(status_code=404, detail="Backup file not found")
         
         # Verify integrity
-        is_valid = backup_manager.verify_backup_integrity(backup_path)
+        is_valid = await asyncio.to_thread(backup_manager.verify_backup_integrity, backup_path)
         
         return {
             "backup_id": backup_id,
@@ -1064,14 +1251,43 @@ async def verify_backup_integrity(backup_id: str, user: AdminUser = Depends(requ
         raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
 
 
+SCRIPTS_LIST_TTL = 60
+
+
+@lru_cache(maxsize=4)
+def _list_dir_names_cached(path: str, bucket: int) -> frozenset:
+    """Names of entries in path, or an empty set if it does not exist"""
+    try:
+        with os.scandir(path) as entries:
+            return frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        return frozenset()
+
+
+def _list_dir_names(path: str) -> frozenset:
+    """Get entry names in path, re-listing at most every SCRIPTS_LIST_TTL seconds"""
+    return _list_dir_names_cached(path, int(time.time() // SCRIPTS_LIST_TTL))
+
+
+# Disaster recovery readiness rules: (check, points, recommendation if check fails).
+# Tiered criteria are split into cumulative steps, e.g. 1 + 2 points for 1 and 3 backups.
+_READINESS_RULES = (
+    (lambda m: m["completed"] >= 1, 1, None),
+    (lambda m: m["completed"] >= 3, 2, "Ensure at least 3 recent successful backups"),
+    (lambda m: m["free_gb"] >= 5, 1, None),
+    (lambda m: m["free_gb"] >= 10, 1, "Free up disk space (minimum 10GB recommended)"),
+    (lambda m: m["scheduler_running"], 1, "Enable backup scheduler"),
+    (lambda m: m["chromadb_backups"] >= 1, 1, "Create ChromaDB backups"),
+    (lambda m: m["chromadb_backups"] >= 3, 1, None),
+    (lambda m: m["scripts"] >= 1, 1, None),
+    (lambda m: m["scripts"] >= 2, 1, None),
+)
+
+
 @router.get("/disaster-recovery/status")
 async def get_disaster_recovery_status(user: AdminUser = Depends(require_auth)):
     """Get disaster recovery readiness status"""
     try:
-        from backup import get_backup_manager, get_chromadb_backup_manager
-        from pathlib import Path
-        import shutil
-        
         # Check backup systems
         sqlite_manager = get_backup_manager()
         chromadb_manager = get_chromadb_backup_manager()
@@ -1079,55 +1295,30 @@ async def get_disaster_recovery_status(user: AdminUser = Depends(require_auth)):
         # Get backup counts and recent status
         sqlite_status = sqlite_manager.get_backup_status()
         recent_backups = sqlite_manager.get_backup_history(limit=5)
+        completed = sum(1 for b in recent_backups if b.get("status") == "completed")
         
         # Check ChromaDB backups
-        chromadb_backups = 0
-        if chromadb_manager.chromadb_backup_dir.exists():
-            for subdir in ["daily", "weekly", "snapshots"]:
-                backup_dir = chromadb_manager.chromadb_backup_dir / subdir
-                if backup_dir.exists():
-                    chromadb_backups += len(list(backup_dir.glob("*.tar*")))
+        chromadb_backups = _chromadb_backup_summary(chromadb_manager)["count"]
         
         # Check disk space
-        total, used, free = shutil.disk_usage("/refdata")
-        free_gb = free // (1024**3)
+        free_gb = _free_disk_bytes("/refdata") // (1024**3)
         
-        # Check scripts
-        scripts_dir = Path("/home/jikhanjung/projects/RefServer/scripts")
-        recovery_script = scripts_dir / "disaster_recovery.sh"
-        check_script = scripts_dir / "check_backups.sh"
+        # Check scripts with a single directory listing
+        present = _list_dir_names("/home/jikhanjung/projects/RefServer/scripts")
+        has_recovery = "disaster_recovery.sh" in present
+        has_check = "check_backups.sh" in present
         
         # Calculate readiness score
-        score = 0
-        max_score = 10
-        
-        # Recent backups (3 points)
-        if len([b for b in recent_backups if b.get("status") == "completed"]) >= 3:
-            score += 3
-        elif len([b for b in recent_backups if b.get("status") == "completed"]) >= 1:
-            score += 1
-        
-        # Disk space (2 points)
-        if free_gb >= 10:
-            score += 2
-        elif free_gb >= 5:
-            score += 1
-        
-        # ChromaDB backups (2 points)
-        if chromadb_backups >= 3:
-            score += 2
-        elif chromadb_backups >= 1:
-            score += 1
-        
-        # Scripts available (2 points)
-        if recovery_script.exists() and check_script.exists():
-            score += 2
-        elif recovery_script.exists() or check_script.exists():
-            score += 1
-        
-        # Scheduler running (1 point)
-        if sqlite_status.get("scheduler_running"):
-            score += 1
+        metrics = {
+            "completed": completed,
+            "free_gb": free_gb,
+            "chromadb_backups": chromadb_backups,
+            "scripts": has_recovery + has_check,
+            "scheduler_running": bool(sqlite_status.get("scheduler_running"))
+        }
+        score = sum(points for check, points, _ in _READINESS_RULES if check(metrics))
+        max_score = sum(points for _, points, _ in _READINESS_RULES)
+        recommendations = [rec for check, _, rec in _READINESS_RULES if rec and not check(metrics)]
         
         # Determine readiness level
         if score >= 8:
@@ -1144,19 +1335,14 @@ async def get_disaster_recovery_status(user: AdminUser = Depends(require_auth)):
             "readiness_level": readiness,
             "sqlite_backups": sqlite_status.get("total_backups", 0),
             "chromadb_backups": chromadb_backups,
-            "recent_successful_backups": len([b for b in recent_backups if b.get("status") == "completed"]),
+            "recent_successful_backups": completed,
             "free_disk_space_gb": free_gb,
             "scheduler_running": sqlite_status.get("scheduler_running", False),
             "recovery_scripts_available": {
-                "disaster_recovery": recovery_script.exists(),
-                "backup_check": check_script.exists()
+                "disaster_recovery": has_recovery,
+                "backup_check": has_check
             },
-            "recommendations": [
-                "Ensure at least 3 recent successful backups" if len([b for b in recent_backups if b.get("status") == "completed"]) < 3 else None,
-                "Free up disk space (minimum 10GB recommended)" if free_gb < 10 else None,
-                "Enable backup scheduler" if not sqlite_status.get("scheduler_running") else None,
-                "Create ChromaDB backups" if chromadb_backups == 0 else None
-            ]
+            "recommendations": recommendations
         }
         
     except Exception as e:
@@ -1169,10 +1355,8 @@ async def get_disaster_recovery_status(user: AdminUser = Depends(require_auth)):
 async def run_consistency_check(user: AdminUser = Depends(require_auth)):
     """Run full database consistency check"""
     try:
-        from consistency_check import get_consistency_checker
-        
         checker = get_consistency_checker()
-        results = checker.run_full_consistency_check()
+        results = await asyncio.to_thread(checker.run_full_consistency_check)
         
         return results
         
@@ -1185,10 +1369,8 @@ async def run_consistency_check(user: AdminUser = Depends(require_auth)):
 async def get_consistency_summary(user: AdminUser = Depends(require_auth)):
     """Get quick consistency summary"""
     try:
-        from consistency_check import get_consistency_checker
-        
         checker = get_consistency_checker()
-        summary = checker.get_consistency_summary()
+        summary = _poll_cached("consistency_summary", checker.get_consistency_summary)
         
         return summary
         
@@ -1208,8 +1390,6 @@ async def fix_consistency_issues(
         if not user.is_superuser:
             raise HTTPException(status_code=403, detail="Only superusers can fix consistency issues")
         
-        from consistency_check import get_consistency_checker, ConsistencyIssueType
-        
         checker = get_consistency_checker()
         
         # Convert string issue types to enum
@@ -1220,7 +1400,8 @@ async def fix_consistency_issues(
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=f"Invalid issue type: {str(e)}")
         
-        results = checker.auto_fix_issues(fix_types)
+        results = await asyncio.to_thread(checker.auto_fix_issues, fix_types)
+        _invalidate_poll_cache("consistency_summary")
         
         return results
         
@@ -1235,10 +1416,8 @@ async def fix_consistency_issues(
 async def consistency_management_page(request: Request, user: AdminUser = Depends(require_auth)):
     """Database consistency management page"""
     try:
-        from consistency_check import get_consistency_checker
-        
         checker = get_consistency_checker()
-        summary = checker.get_consistency_summary()
+        summary = _poll_cached("consistency_summary", checker.get_consistency_summary)
         
         return templates.TemplateResponse(
             "consistency_management.html",
@@ -1246,7 +1425,7 @@ async def consistency_management_page(request: Request, user: AdminUser = Depend
                 "request": request,
                 "user": user,
                 "consistency_summary": summary,
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
         
@@ -1257,7 +1436,7 @@ async def consistency_management_page(request: Request, user: AdminUser = Depend
                 "request": request,
                 "user": user,
                 "error": f"Error loading consistency management: {str(e)}",
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
 
@@ -1268,7 +1447,7 @@ async def services_management_page(request: Request, user: AdminUser = Depends(r
     """Service circuit breaker management page"""
     try:
         circuit_manager = get_circuit_breaker_manager()
-        services_status = circuit_manager.get_all_status()
+        services_status = _poll_cached("services_status", circuit_manager.get_all_status)
         
         return templates.TemplateResponse(
             "services_management.html",
@@ -1276,7 +1455,7 @@ async def services_management_page(request: Request, user: AdminUser = Depends(r
                 "request": request,
                 "user": user,
                 "services_status": services_status,
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
         
@@ -1287,7 +1466,7 @@ async def services_management_page(request: Request, user: AdminUser = Depends(r
                 "request": request,
                 "user": user,
                 "error": f"Error loading services management: {str(e)}",
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
 
@@ -1297,7 +1476,7 @@ async def get_services_status(user: AdminUser = Depends(require_auth)):
     """Get current status of all circuit breakers"""
     try:
         circuit_manager = get_circuit_breaker_manager()
-        return circuit_manager.get_all_status()
+        return _poll_cached("services_status", circuit_manager.get_all_status)
         
     except Exception as e:
         logger.error(f"Failed to get services status: {e}")
@@ -1314,6 +1493,7 @@ async def disable_service(
     try:
         circuit_manager = get_circuit_breaker_manager()
         circuit_manager.force_open_service(service_name, reason)
+        _invalidate_poll_cache("services_status")
         
         return {
             "success": True,
@@ -1336,6 +1516,7 @@ async def enable_service(
     try:
         circuit_manager = get_circuit_breaker_manager()
         circuit_manager.force_close_service(service_name)
+        _invalidate_poll_cache("services_status")
         
         return {
             "success": True,
@@ -1357,6 +1538,7 @@ async def reset_service_stats(
     try:
         circuit_manager = get_circuit_breaker_manager()
         circuit_manager.reset_service_stats(service_name)
+        _invalidate_poll_cache("services_status")
         
         return {
             "success": True,
@@ -1369,6 +1551,78 @@ async def reset_service_stats(
         raise HTTPException(status_code=500, detail=f"Failed to reset service stats: {str(e)}")
 
 
+def _probe_ollama_llava() -> Dict[str, Any]:
+    """Check LLaVA (OCR quality) Ollama connection"""
+    from ocr_quality import get_quality_assessor
+    assessor = get_quality_assessor()
+    return {
+        "success": assessor.check_ollama_connection(),
+        "service_enabled": assessor.enabled,
+        "host": assessor.ollama_host if assessor.enabled else "Disabled"
+    }
+
+
+def _probe_ollama_metadata() -> Dict[str, Any]:
+    """Check metadata extraction Ollama connection"""
+    from metadata import get_metadata_extractor
+    extractor = get_metadata_extractor()
+    return {
+        "success": extractor.check_ollama_connection(),
+        "service_enabled": extractor.enabled,
+        "host": extractor.ollama_host if extractor.enabled else "Disabled",
+        "model": extractor.model_name if extractor.enabled else "N/A"
+    }
+
+
+def _probe_huridocs_layout() -> Dict[str, Any]:
+    """Check Huridocs layout service availability"""
+    from layout import is_layout_service_available
+    return {"success": is_layout_service_available()}
+
+
+SERVICE_PROBES = {
+    "ollama_llava": _probe_ollama_llava,
+    "ollama_metadata": _probe_ollama_metadata,
+    "huridocs_layout": _probe_huridocs_layout
+}
+
+
+async def _run_probe(service_name: str) -> Dict[str, Any]:
+    """Run a service probe in a worker thread so it does not block the event loop"""
+    probe = SERVICE_PROBES.get(service_name)
+    if probe is None:
+        return {"success": False, "error": "Unknown service"}
+    try:
+        return await asyncio.to_thread(probe)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@router.post("/services/test-all")
+async def test_all_service_connections(user: AdminUser = Depends(require_auth)):
+    """Test connections to all services concurrently"""
+    try:
+        circuit_manager = get_circuit_breaker_manager()
+        
+        names = list(SERVICE_PROBES)
+        results = await asyncio.gather(*(_run_probe(name) for name in names))
+        
+        return {
+            "services": {
+                name: {
+                    "test_result": result,
+                    "circuit_breaker_status": circuit_manager.get_breaker(name).get_status()
+                }
+                for name, result in zip(names, results)
+            },
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to test services: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to test services: {str(e)}")
+
+
 @router.post("/services/{service_name}/test")
 async def test_service_connection(
     service_name: str,
@@ -1378,40 +1632,8 @@ async def test_service_connection(
     try:
         circuit_manager = get_circuit_breaker_manager()
         
-        # Get the specific service and test its connection
-        test_result = {"success": False, "error": "Unknown service"}
-        
-        if service_name == "ollama_llava":
-            from ocr_quality import get_quality_assessor
-            try:
-                assessor = get_quality_assessor()
-                test_result = {
-                    "success": assessor.check_ollama_connection(),
-                    "service_enabled": assessor.enabled,
-                    "host": assessor.ollama_host if assessor.enabled else "Disabled"
-                }
-            except Exception as e:
-                test_result = {"success": False, "error": str(e)}
-                
-        elif service_name == "ollama_metadata":
-            from metadata import get_metadata_extractor
-            try:
-                extractor = get_metadata_extractor()
-                test_result = {
-                    "success": extractor.check_ollama_connection(),
-                    "service_enabled": extractor.enabled,
-                    "host": extractor.ollama_host if extractor.enabled else "Disabled",
-                    "model": extractor.model_name if extractor.enabled else "N/A"
-                }
-            except Exception as e:
-                test_result = {"success": False, "error": str(e)}
-                
-        elif service_name == "huridocs_layout":
-            from layout import is_layout_service_available
-            try:
-                test_result = {"success": is_layout_service_available()}
-            except Exception as e:
-                test_result = {"success": False, "error": str(e)}
+        # Test the specific service connection off the event loop
+        test_result = await _run_probe(service_name)
         
         # Get current circuit breaker status
         breaker_status = circuit_manager.get_breaker(service_name).get_status()
@@ -1430,10 +1652,8 @@ async def test_service_connection(
 
 # Database management
 @router.get("/database", response_class=HTMLResponse)
-async def database_management(request: Request):
+async def database_management(request: Request, user: AdminUser = Depends(require_auth)):
     """Database management page"""
-    user = require_auth(request)
-    
     # Only superusers can access database management
     if not user.is_superuser:
         raise HTTPException(status_code=403, detail="Superuser access required")
@@ -1447,15 +1667,13 @@ async def database_management(request: Request):
             "user": user, 
             "stats": stats,
             "page_title": "Database Management",
-            "version": get_version()
+            "version": APP_VERSION
         }
     )
 
 @router.post("/database/reset")
-async def reset_database(request: Request):
+async def reset_database(request: Request, user: AdminUser = Depends(require_auth)):
     """Reset all database data (DANGER: This will delete all data!)"""
-    user = require_auth(request)
-    
     # Only superusers can reset database
     if not user.is_superuser:
         raise HTTPException(status_code=403, detail="Superuser access required")
@@ -1471,57 +1689,32 @@ async def reset_database(request: Request):
         # 1. Clear SQLite tables
         logger.info("🗑️ Clearing SQLite tables...")
         
-        # Delete in correct order to avoid foreign key constraints
-        from models import ProcessingJob, PageEmbedding, Embedding, LayoutAnalysis, Metadata, Paper
-        
-        ProcessingJob.delete().execute()
-        logger.info("  ✅ ProcessingJob table cleared")
-        
-        PageEmbedding.delete().execute()
-        logger.info("  ✅ PageEmbedding table cleared")
+        # Delete every table in one transaction with FK checks off. Tables
+        # that would have been cleared by ON DELETE CASCADE are listed too.
+        from models import (ProcessingJob, PageEmbedding, Embedding, LayoutAnalysis, Metadata, Paper,
+                            FileHash, ContentHash, SampleEmbeddingHash)
         
-        Embedding.delete().execute()
-        logger.info("  ✅ Embedding table cleared")
-        
-        LayoutAnalysis.delete().execute()
-        logger.info("  ✅ LayoutAnalysis table cleared")
-        
-        Metadata.delete().execute()
-        logger.info("  ✅ Metadata table cleared")
-        
-        Paper.delete().execute()
-        logger.info("  ✅ Paper table cleared")
+        # PRAGMA foreign_keys is a no-op inside a transaction, so toggle it outside
+        db.execute_sql('PRAGMA foreign_keys=OFF')
+        try:
+            with db.atomic():
+                for model in (ProcessingJob, PageEmbedding, Embedding, LayoutAnalysis, Metadata,
+                              FileHash, ContentHash, SampleEmbeddingHash, Paper):
+                    deleted = model.delete().execute()
+                    logger.info(f"  ✅ {model.__name__} table cleared ({deleted} rows)")
+        finally:
+            db.execute_sql('PRAGMA foreign_keys=ON')
         
         # 2. Clear ChromaDB collections
         logger.info("🗑️ Clearing ChromaDB collections...")
         try:
             vector_db = get_vector_db()
             
-            # Delete all documents from collections
-            papers_collection = vector_db.papers_collection
-            pages_collection = vector_db.pages_collection
+            # Drop and recreate collections instead of fetching every ID
+            removed = vector_db.reset_collections()
+            logger.info(f"  ✅ ChromaDB papers collection cleared ({removed['papers']} documents)")
+            logger.info(f"  ✅ ChromaDB pages collection cleared ({removed['pages']} documents)")
             
-            # Get all IDs and delete them
-            try:
-                papers_result = papers_collection.get()
-                if papers_result['ids']:
-                    papers_collection.delete(ids=papers_result['ids'])
-                    logger.info(f"  ✅ ChromaDB papers collection cleared ({len(papers_result['ids'])} documents)")
-                else:
-                    logger.info("  ✅ ChromaDB papers collection was already empty")
-            except Exception as e:
-                logger.warning(f"  ⚠️ Error clearing papers collection: {e}")
-            
-            try:
-                pages_result = pages_collection.get()
-                if pages_result['ids']:
-                    pages_collection.delete(ids=pages_result['ids'])
-                    logger.info(f"  ✅ ChromaDB pages collection cleared ({len(pages_result['ids'])} documents)")
-                else:
-                    logger.info("  ✅ ChromaDB pages collection was already empty")
-            except Exception as e:
-                logger.warning(f"  ⚠️ Error clearing pages collection: {e}")
-                
         except Exception as e:
             logger.error(f"  ❌ Error clearing ChromaDB: {e}")
         
@@ -1534,17 +1727,15 @@ async def reset_database(request: Request):
                 # Clear PDFs directory
                 pdfs_dir = os.path.join(data_dir, 'pdfs')
                 if os.path.exists(pdfs_dir):
-                    for filename in os.listdir(pdfs_dir):
-                        if filename.endswith('.pdf'):
-                            os.remove(os.path.join(pdfs_dir, filename))
+                    shutil.rmtree(pdfs_dir, ignore_errors=True)
+                    os.makedirs(pdfs_dir, exist_ok=True)
                     logger.info(f"  ✅ PDF files cleared from {pdfs_dir}")
                 
                 # Clear images directory
                 images_dir = os.path.join(data_dir, 'images')
                 if os.path.exists(images_dir):
-                    for filename in os.listdir(images_dir):
-                        if filename.endswith(('.png', '.jpg', '.jpeg')):
-                            os.remove(os.path.join(images_dir, filename))
+                    shutil.rmtree(images_dir, ignore_errors=True)
+                    os.makedirs(images_dir, exist_ok=True)
                     logger.info(f"  ✅ Image files cleared from {images_dir}")
                 
                 # Clear temp directory
@@ -1554,6 +1745,11 @@ async def reset_database(request: Request):
                     os.makedirs(temp_dir, exist_ok=True)
                     logger.info(f"  ✅ Temp directory cleared: {temp_dir}")
         
+        # The page image cache may be configured outside the data dirs
+        _remove_page_image_cache()
+        logger.info(f"  ✅ Page image cache cleared: {PAGE_IMAGE_CACHE_DIR}")
+        
+        invalidate_stats_cache()
         logger.info("✅ Database reset completed successfully")
         
         return {
@@ -1567,16 +1763,13 @@ async def reset_database(request: Request):
         raise HTTPException(status_code=500, detail=f"Database reset failed: {str(e)}")
 
 @router.post("/papers/{doc_id}/regenerate-page-embeddings")
-async def regenerate_page_embeddings(doc_id: str, request: Request):
+async def regenerate_page_embeddings(doc_id: str, request: Request, user: AdminUser = Depends(require_auth)):
     """Regenerate page embeddings for a specific paper and save to ChromaDB"""
-    user = require_auth(request)
-    
     # Only superusers can regenerate embeddings
     if not user.is_superuser:
         raise HTTPException(status_code=403, detail="Superuser access required")
     
     try:
-        from models import Paper, PageEmbedding
         from embedding import save_page_embeddings_to_vectordb
         from text_extraction import extract_page_texts_from_pdf
         from embedding import generate_page_embeddings
@@ -1605,7 +1798,7 @@ async def regenerate_page_embeddings(doc_id: str, request: Request):
         
         # Generate new embeddings
         logger.info(f"🧮 Generating new page embeddings...")
-        page_embeddings = generate_page_embeddings(page_texts)
+        page_embeddings = await asyncio.to_thread(generate_page_embeddings, page_texts)
         
         if not page_embeddings or len(page_embeddings) != page_count:
             raise HTTPException(status_code=500, detail=f"Embedding generation failed: expected {page_count}, got {len(page_embeddings) if page_embeddings else 0}")
@@ -1617,19 +1810,9 @@ async def regenerate_page_embeddings(doc_id: str, request: Request):
         
         logger.info(f"📊 Prepared {len(page_embeddings_data)} page embeddings for save")
         
-        # Save to ChromaDB
-        logger.info(f"💾 Saving page embeddings to ChromaDB...")
-        success = save_page_embeddings_to_vectordb(doc_id, page_embeddings_data)
-        
-        if success:
-            logger.info(f"✅ Page embeddings regenerated successfully for {doc_id}")
-            
-            # Update SQLite metadata (replace existing records)
+        def replace_sqlite_page_embeddings():
+            """Replace the SQLite page metadata rows (vectors live in ChromaDB)"""
             try:
-                # Delete existing page embeddings
-                PageEmbedding.delete().where(PageEmbedding.paper == paper).execute()
-                
-                # Insert new metadata (without vector blobs since they're in ChromaDB)
                 batch_data = []
                 for page_number, page_text, embedding_vector in page_embeddings_data:
                     batch_data.append({
@@ -1641,12 +1824,28 @@ async def regenerate_page_embeddings(doc_id: str, request: Request):
                         'model_name': 'bge-m3'
                     })
                 
-                PageEmbedding.insert_many(batch_data).execute()
+                # Replace existing page embeddings in one transaction, keeping
+                # each multi-row INSERT under SQLite's bound-parameter limit
+                with db.atomic():
+                    PageEmbedding.delete().where(PageEmbedding.paper == paper).execute()
+                    for batch in chunked(batch_data, 100):
+                        PageEmbedding.insert_many(batch).execute()
+                
+                invalidate_stats_cache()
                 logger.info(f"✅ Updated SQLite metadata for {len(batch_data)} page embeddings")
                 
             except Exception as sqlite_error:
                 logger.warning(f"⚠️ Failed to update SQLite metadata: {sqlite_error}")
-                # ChromaDB save was successful, so this is not critical
+                # ChromaDB is the source of truth for vectors, so this is not critical
+        
+        # Save to ChromaDB first, off the event loop; SQLite rows are only
+        # replaced once the vectors are stored, so the two stay in step
+        logger.info(f"💾 Saving page embeddings to ChromaDB...")
+        success = await asyncio.to_thread(save_page_embeddings_to_vectordb, doc_id, page_embeddings_data)
+        
+        if success:
+            await asyncio.to_thread(replace_sqlite_page_embeddings)
+            logger.info(f"✅ Page embeddings regenerated successfully for {doc_id}")
             
             return {
                 "success": True,
@@ -1674,8 +1873,6 @@ async def security_settings_page(request: Request):
         raise HTTPException(status_code=403, detail="Superuser access required")
     
     try:
-        from file_security import get_security_status
-        
         security_status = get_security_status()
         
         return templates.TemplateResponse(
@@ -1684,7 +1881,7 @@ async def security_settings_page(request: Request):
                 "request": request,
                 "user": user,
                 "security_status": security_status,
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
         
@@ -1695,7 +1892,7 @@ async def security_settings_page(request: Request):
                 "request": request,
                 "user": user,
                 "error": f"Error loading security settings: {str(e)}",
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
 
@@ -1704,7 +1901,6 @@ async def security_settings_page(request: Request):
 async def get_security_status_api(user: AdminUser = Depends(require_auth)):
     """Get current security system status"""
     try:
-        from file_security import get_security_status
         return get_security_status()
         
     except Exception as e:
@@ -1723,14 +1919,12 @@ async def toggle_quarantine(
         if not user.is_superuser:
             raise HTTPException(status_code=403, detail="Only superusers can change security settings")
         
-        from file_security import get_file_validator
+        # Persist setting so it survives restarts and reaches all workers
+        settings = {'enable_quarantine': enable}
+        get_settings_store().set(**settings)
         
         validator = get_file_validator()
-        validator.config.enable_quarantine = enable
-        
-        # Update environment variable (for current session)
-        import os
-        os.environ['ENABLE_QUARANTINE'] = 'true' if enable else 'false'
+        validator.config.apply_settings(settings)
         
         logger.info(f"File quarantine {'enabled' if enable else 'disabled'} by {user.username}")
         
@@ -1760,20 +1954,20 @@ async def update_security_limits(
         if not user.is_superuser:
             raise HTTPException(status_code=403, detail="Only superusers can change security settings")
         
-        from file_security import get_file_validator
+        max_file_size = max_file_size_mb * 1024 * 1024  # Convert MB to bytes
         
-        validator = get_file_validator()
+        # Persist settings so they survive restarts and reach all workers
+        settings = {
+            'max_file_size': max_file_size,
+            'max_uploads_per_hour': max_uploads_per_hour,
+            'max_uploads_per_day': max_uploads_per_day
+        }
+        get_settings_store().set(**settings)
         
-        # Update configuration
-        validator.config.max_file_size = max_file_size_mb * 1024 * 1024  # Convert MB to bytes
-        validator.config.max_uploads_per_hour = max_uploads_per_hour
-        validator.config.max_uploads_per_day = max_uploads_per_day
+        validator = get_file_validator()
         
-        # Update environment variables (for current session)
-        import os
-        os.environ['MAX_FILE_SIZE'] = str(validator.config.max_file_size)
-        os.environ['MAX_UPLOADS_PER_HOUR'] = str(max_uploads_per_hour)
-        os.environ['MAX_UPLOADS_PER_DAY'] = str(max_uploads_per_day)
+        # Update configuration in one locked step
+        validator.config.apply_settings(settings)
         
         logger.info(f"Security limits updated by {user.username}: {max_file_size_mb}MB, {max_uploads_per_hour}/hour, {max_uploads_per_day}/day")
         
@@ -1798,8 +1992,6 @@ async def update_security_limits(
 async def get_quarantine_files(user: AdminUser = Depends(require_auth)):
     """Get list of quarantined files"""
     try:
-        from file_security import get_file_validator
-        
         validator = get_file_validator()
         quarantine_info = validator.get_quarantine_info()
         
@@ -1811,22 +2003,26 @@ async def get_quarantine_files(user: AdminUser = Depends(require_auth)):
 
 
 @router.delete("/security/quarantine/clear")
-async def clear_quarantine(user: AdminUser = Depends(require_auth)):
+async def clear_quarantine(background_tasks: BackgroundTasks, user: AdminUser = Depends(require_auth)):
     """Clear all quarantined files"""
     try:
         # Only superusers can clear quarantine
         if not user.is_superuser:
             raise HTTPException(status_code=403, detail="Only superusers can clear quarantine")
         
-        from file_security import get_file_validator
         import shutil
+        import uuid
         
         validator = get_file_validator()
-        
-        if validator.config.enable_quarantine and validator.config.quarantine_dir.exists():
-            # Remove all files in quarantine directory
-            shutil.rmtree(validator.config.quarantine_dir)
-            validator.config.quarantine_dir.mkdir(parents=True, exist_ok=True)
+        quarantine_dir = validator.config.quarantine_dir
+        
+        if validator.config.enable_quarantine and quarantine_dir.exists():
+            # Swap in an empty directory first so quarantine writes never see it
+            # missing, then delete the old contents after the response
+            retired_dir = quarantine_dir.with_name(f"{quarantine_dir.name}.gc-{uuid.uuid4().hex}")
+            quarantine_dir.rename(retired_dir)
+            quarantine_dir.mkdir(parents=True, exist_ok=True)
+            background_tasks.add_task(shutil.rmtree, retired_dir, ignore_errors=True)
             
             logger.info(f"Quarantine cleared by {user.username}")
             
@@ -1847,77 +2043,157 @@ async def clear_quarantine(user: AdminUser = Depends(require_auth)):
         raise HTTPException(status_code=500, detail=f"Failed to clear quarantine: {str(e)}")
 
 
+def _get_paper_fields(doc_id: str, *fields):
+    """Fetch only the given Paper columns as a namedtuple, or raise 404"""
+    paper = Paper.select(*fields).where(Paper.doc_id == doc_id).namedtuples().first()
+    if paper is None:
+        raise HTTPException(status_code=404, detail=f"Paper not found: {doc_id}")
+    return paper
+
+
+class LargeFileResponse(FileResponse):
+    """FileResponse that streams in 1 MiB chunks instead of Starlette's 64 KiB"""
+    chunk_size = 1024 * 1024
+
+
+# Unique key of PageEmbedding, used as the upsert conflict target
+PAGE_EMBEDDING_KEY = [PageEmbedding.paper, PageEmbedding.page_number]
+
+
+def _page_embedding_row(doc_id: str, page_number: int, page_text: str, embedding_vector=None) -> Dict[str, Any]:
+    """Column values for inserting a page; the vector is stored as int8 when given"""
+    row = {
+        'paper': doc_id,
+        'page_number': page_number,
+        'page_text': page_text,
+        'vector_blob': b'',
+        'vector_dim': 0,
+        'vector_scale': None,
+        'model_name': 'tesseract-ocr'
+    }
+    if embedding_vector is not None:
+        row['vector_blob'], row['vector_scale'] = serialize_vector_int8(embedding_vector)
+        row['vector_dim'] = len(embedding_vector)
+        row['model_name'] = 'bge-m3'
+    return row
+
+
 # Page Image Generation
+PAGE_IMAGE_DPI = 150  # Good quality for display
+PAGE_IMAGE_CACHE_DIR = os.getenv("PAGE_IMAGE_CACHE_DIR", "/refdata/images/page_cache")
+
+
+def _remove_page_image_cache(doc_id: Optional[str] = None):
+    """Delete cached page images for one paper, or for all papers"""
+    import shutil
+    target = os.path.join(PAGE_IMAGE_CACHE_DIR, doc_id) if doc_id else PAGE_IMAGE_CACHE_DIR
+    shutil.rmtree(target, ignore_errors=True)
+
+
+def _page_image_etag(doc_id: str, page_number: int, mtime_ns: int) -> str:
+    """Strong ETag for a rendered page; changes whenever the PDF is replaced"""
+    import hashlib
+    key = f"{doc_id}:{page_number}:{mtime_ns}:{PAGE_IMAGE_DPI}"
+    return '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
+
+
 @router.get("/page-image/{doc_id}/{page_number}")
 async def get_page_image(
+    request: Request,
     doc_id: str, 
     page_number: int,
     user: AdminUser = Depends(require_auth)
 ):
     """Generate and return a specific page as an image"""
     try:
-        from models import Paper
-        import pdf2image
-        from fastapi.responses import StreamingResponse
+        from ocr import render_pdf_page
+        from fastapi.responses import StreamingResponse, FileResponse, Response
         import io
         import os
         
         # Get paper info
-        try:
-            paper = Paper.get(Paper.doc_id == doc_id)
-        except Paper.DoesNotExist:
-            raise HTTPException(status_code=404, detail=f"Paper not found: {doc_id}")
+        paper = _get_paper_fields(doc_id, Paper.file_path)
         
         # Check if PDF file exists
         pdf_path = paper.file_path
-        if not os.path.exists(pdf_path):
+        try:
+            pdf_mtime_ns = os.stat(pdf_path).st_mtime_ns
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail=f"PDF file not found: {pdf_path}")
         
-        logger.info(f"Generating image for page {page_number} of {pdf_path}")
+        # Rendered pages only change when the PDF does, so let the browser keep them
+        etag = _page_image_etag(doc_id, page_number, pdf_mtime_ns)
+        cache_headers = {
+            "ETag": etag,
+            "Cache-Control": "private, max-age=31536000, immutable"
+        }
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=cache_headers)
         
-        # Convert specific page to image
+        headers = {
+            "Content-Disposition": f"inline; filename=page_{page_number}_{doc_id}.png",
+            **cache_headers
+        }
+        
+        # Serve a previously rendered page straight from disk
+        cache_path = os.path.join(PAGE_IMAGE_CACHE_DIR, doc_id, f"{page_number}.png")
         try:
-            # Try with specific poppler path if needed
-            poppler_path = None
-            if os.path.exists('/usr/bin'):
-                poppler_path = '/usr/bin'
+            if os.stat(cache_path).st_mtime_ns >= pdf_mtime_ns:
+                return FileResponse(cache_path, media_type="image/png", headers=headers)
+        except FileNotFoundError:
+            pass
+        
+        logger.info(f"Generating image for page {page_number} of {pdf_path}")
+        
+        def render_to_cache() -> Optional[io.BytesIO]:
+            """Render, encode and cache the page; runs in a worker thread"""
+            # Render in-process from a cached PyMuPDF document instead of
+            # spawning poppler and re-parsing the PDF for every page
+            page_image = render_pdf_page(pdf_path, page_number, dpi=PAGE_IMAGE_DPI)
+            if page_image is None:
+                return None
             
-            logger.info(f"Converting PDF to image with poppler_path: {poppler_path}")
+            # Encode once into a single buffer; fast zlib level keeps encoding cheap
+            buffer = io.BytesIO()
+            page_image.save(buffer, format='PNG', optimize=False, compress_level=1)
             
-            pages = pdf2image.convert_from_path(
-                pdf_path,
-                first_page=page_number,
-                last_page=page_number,
-                dpi=150,  # Good quality for display
-                fmt='PNG',
-                poppler_path=poppler_path
-            )
+            # Persist for later requests; a failed write only costs a re-render
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(buffer.getbuffer())
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.warning(f"Could not cache page image {cache_path}: {e}")
+            
+            buffer.seek(0)
+            return buffer
+        
+        # Convert specific page to image
+        try:
+            # PyMuPDF work is serialised by a lock shared with OCR worker
+            # threads, so it must not run (and wait) on the event loop
+            img_buffer = await asyncio.to_thread(render_to_cache)
             
-            if not pages:
+            if img_buffer is None:
                 logger.error(f"No pages returned for page {page_number}")
                 raise HTTPException(status_code=404, detail=f"Page {page_number} not found in PDF")
             
-            logger.info(f"Successfully converted page {page_number} to image")
-            
-            # Convert PIL image to bytes
-            img_buffer = io.BytesIO()
-            pages[0].save(img_buffer, format='PNG')
-            img_buffer.seek(0)
-            
-            # Get the image data
-            image_data = img_buffer.getvalue()
-            logger.info(f"Image size: {len(image_data)} bytes")
+            image_size = img_buffer.getbuffer().nbytes
+            logger.info(f"Successfully converted page {page_number} to image ({image_size} bytes)")
             
             return StreamingResponse(
-                io.BytesIO(image_data),
+                img_buffer,
                 media_type="image/png",
                 headers={
-                    "Content-Disposition": f"inline; filename=page_{page_number}_{doc_id}.png",
-                    "Content-Length": str(len(image_data)),
-                    "Cache-Control": "no-cache"
+                    "Content-Length": str(image_size),
+                    **headers
                 }
             )
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error converting PDF page to image: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to generate page image: {str(e)}")
@@ -1929,6 +2205,44 @@ async def get_page_image(
         raise HTTPException(status_code=500, detail=f"Failed to get page image: {str(e)}")
 
 
+@router.get("/page-viewer/{doc_id}/pages.json")
+async def page_viewer_page_numbers(
+    request: Request,
+    doc_id: str,
+    user: AdminUser = Depends(require_auth)
+):
+    """Page numbers with an embedding row, for the page viewer's jump menu"""
+    try:
+        from fastapi.responses import Response
+        import hashlib
+        
+        if not Paper.select().where(Paper.doc_id == doc_id).exists():
+            raise HTTPException(status_code=404, detail=f"Paper not found: {doc_id}")
+        
+        page_numbers = [
+            row[0] for row in
+            PageEmbedding
+            .select(PageEmbedding.page_number)
+            .where(PageEmbedding.paper == doc_id)
+            .order_by(PageEmbedding.page_number)
+            .tuples()
+        ]
+        
+        body = orjson.dumps({"doc_id": doc_id, "page_numbers": page_numbers})
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=body, media_type="application/json", headers=headers)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to list pages for {doc_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to list pages: {str(e)}")
+
+
 @router.get("/page-viewer/{doc_id}/{page_number}", response_class=HTMLResponse)
 async def page_viewer(
     request: Request,
@@ -1939,38 +2253,35 @@ async def page_viewer(
     user = require_auth(request)
     
     try:
-        from models import Paper, PageEmbedding
-        
         # Get paper info
-        try:
-            paper = Paper.get(Paper.doc_id == doc_id)
-        except Paper.DoesNotExist:
-            raise HTTPException(status_code=404, detail=f"Paper not found: {doc_id}")
+        paper = _get_paper_fields(doc_id, Paper.doc_id, Paper.filename)
         
         # Get page embedding (for text)
         try:
             page_embedding = PageEmbedding.get(
-                (PageEmbedding.paper == paper) & 
+                (PageEmbedding.paper == doc_id) & 
                 (PageEmbedding.page_number == page_number)
             )
         except PageEmbedding.DoesNotExist:
             page_embedding = None
         
-        # Get all page numbers for this paper for navigation
-        all_pages = list(
+        # Navigation needs only the count and the neighbours of this page;
+        # one aggregate over the (paper, page_number) index provides them
+        before = PageEmbedding.page_number < page_number
+        after = PageEmbedding.page_number > page_number
+        total_pages, pages_before, prev_page, next_page = (
             PageEmbedding
-            .select(PageEmbedding.page_number)
-            .where(PageEmbedding.paper == paper)
-            .order_by(PageEmbedding.page_number)
+            .select(
+                fn.COUNT(PageEmbedding.id),
+                fn.SUM(Case(None, ((before, 1),), 0)),
+                fn.MAX(Case(None, ((before, PageEmbedding.page_number),), None)),
+                fn.MIN(Case(None, ((after, PageEmbedding.page_number),), None))
+            )
+            .where(PageEmbedding.paper == doc_id)
+            .tuples()
+            .get()
         )
-        page_numbers = [p.page_number for p in all_pages]
-        
-        # Calculate navigation info
-        total_pages = len(page_numbers)
-        current_index = page_numbers.index(page_number) if page_number in page_numbers else -1
-        
-        prev_page = page_numbers[current_index - 1] if current_index > 0 else None
-        next_page = page_numbers[current_index + 1] if current_index < total_pages - 1 else None
+        current_index = (pages_before or 0) if page_embedding is not None else -1
         
         return templates.TemplateResponse(
             "page_viewer.html",
@@ -1984,8 +2295,7 @@ async def page_viewer(
                 "current_page_index": current_index + 1,  # 1-based index for display
                 "prev_page": prev_page,
                 "next_page": next_page,
-                "page_numbers": page_numbers,
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
         
@@ -2004,15 +2314,11 @@ async def re_ocr_page_with_tesseract(
 ):
     """Re-OCR a specific page using Tesseract"""
     try:
-        from models import Paper, PageEmbedding
         from ocr import perform_page_ocr_with_tesseract, detect_language_hybrid, get_tesseract_language
         import os
         
         # Get paper info
-        try:
-            paper = Paper.get(Paper.doc_id == doc_id)
-        except Paper.DoesNotExist:
-            raise HTTPException(status_code=404, detail=f"Paper not found: {doc_id}")
+        paper = _get_paper_fields(doc_id, Paper.file_path)
         
         # Check if PDF file exists
         pdf_path = paper.file_path
@@ -2023,16 +2329,17 @@ async def re_ocr_page_with_tesseract(
         
         # Detect language for better OCR results
         try:
-            detected_lang = detect_language_hybrid(pdf_path)
+            detected_lang = await asyncio.to_thread(detect_language_hybrid, pdf_path)
             tesseract_lang = detected_lang if detected_lang else 'eng'
             logger.info(f"Using language {tesseract_lang} for OCR")
         except Exception as e:
             logger.warning(f"Language detection failed: {e}, using English")
             tesseract_lang = 'eng'
         
-        # Perform OCR on the specific page with paragraph detection (PSM 4)
-        extracted_text, confidence = perform_page_ocr_with_tesseract(
-            pdf_path, page_number, tesseract_lang, psm_mode=4
+        # Perform OCR on the specific page with paragraph detection (PSM 4);
+        # rendering takes the shared PyMuPDF lock, so keep it off the event loop
+        extracted_text, confidence = await asyncio.to_thread(
+            perform_page_ocr_with_tesseract, pdf_path, page_number, tesseract_lang, psm_mode=4
         )
         
         if not extracted_text:
@@ -2044,7 +2351,7 @@ async def re_ocr_page_with_tesseract(
         existing_text = ""
         try:
             page_embedding = PageEmbedding.get(
-                (PageEmbedding.paper == paper) & 
+                (PageEmbedding.paper == doc_id) & 
                 (PageEmbedding.page_number == page_number)
             )
             existing_text = page_embedding.page_text or ""
@@ -2053,7 +2360,12 @@ async def re_ocr_page_with_tesseract(
         
         # Generate embedding comparison if both texts exist
         embedding_comparison = None
-        if existing_text and extracted_text:
+        if existing_text and extracted_text and existing_text == extracted_text:
+            # Same text means same embedding; skip both inference passes
+            from embedding_utils import create_identical_text_report
+            embedding_comparison = create_identical_text_report(extracted_text)
+            logger.info("Re-OCR reproduced the existing text; skipped embedding comparison")
+        elif existing_text and extracted_text:
             try:
                 from embedding import generate_text_embedding
                 from embedding_utils import create_embedding_comparison_report
@@ -2111,13 +2423,12 @@ async def apply_ocr_result(
 ):
     """Apply selected OCR result to page embedding with comparison"""
     try:
-        from models import Paper, PageEmbedding
         from embedding_utils import create_embedding_comparison_report
-        import json
+        import numpy as np
         
         # Get request body
         body = await request.body()
-        data = json.loads(body.decode('utf-8'))
+        data = orjson.loads(body)
         
         selected_text = data.get('selected_text', '')
         apply_to_all = data.get('apply_to_all', False)
@@ -2143,8 +2454,11 @@ async def apply_ocr_result(
             )
             # Get existing embedding from vector_blob
             if existing_page_embedding.vector_blob:
-                import numpy as np
-                old_embedding = np.frombuffer(existing_page_embedding.vector_blob, dtype=np.float32).tolist()
+                old_embedding = deserialize_vector(
+                    existing_page_embedding.vector_blob,
+                    existing_page_embedding.vector_dim,
+                    existing_page_embedding.vector_scale
+                )
             else:
                 old_embedding = None
             old_text = existing_page_embedding.page_text or ""
@@ -2157,70 +2471,28 @@ async def apply_ocr_result(
             from embedding import generate_text_embedding
             embedding_vector = generate_text_embedding(selected_text)
             if embedding_vector is not None:
-                new_embedding = embedding_vector.tolist()
+                new_embedding = np.asarray(embedding_vector, dtype=np.float32)
         except Exception as emb_error:
             logger.warning(f"Failed to generate new embedding: {emb_error}")
         
         # Compare embeddings if both exist
-        if old_embedding and new_embedding:
+        if old_embedding is not None and new_embedding is not None:
             embedding_comparison = create_embedding_comparison_report(
                 old_embedding, new_embedding, old_text, selected_text
             )
             logger.info(f"Embedding comparison: {embedding_comparison.get('overall_assessment', 'unknown')}")
         
-        # Update or create page embedding
-        try:
-            page_embedding = PageEmbedding.get(
-                (PageEmbedding.paper == paper) & 
-                (PageEmbedding.page_number == page_number)
-            )
-            # Update existing embedding
-            page_embedding.page_text = selected_text
-            if new_embedding:
-                import numpy as np
-                # Convert to numpy array and store as blob
-                vector_array = np.array(new_embedding, dtype=np.float32)
-                page_embedding.vector_blob = vector_array.tobytes()
-                page_embedding.vector_dim = len(new_embedding)
-            page_embedding.save()
-            logger.info(f"Updated page embedding for page {page_number}")
-            
-        except PageEmbedding.DoesNotExist:
-            # Create new page embedding
-            try:
-                from embedding import generate_text_embedding
-                embedding_vector = generate_text_embedding(selected_text)
-                if embedding_vector is not None:
-                    import numpy as np
-                    vector_array = np.array(embedding_vector, dtype=np.float32)
-                    PageEmbedding.create(
-                        paper=paper,
-                        page_number=page_number,
-                        page_text=selected_text,
-                        vector_blob=vector_array.tobytes(),
-                        vector_dim=len(embedding_vector),
-                        model_name='bge-m3'
-                    )
-                else:
-                    PageEmbedding.create(
-                        paper=paper,
-                        page_number=page_number,
-                        page_text=selected_text,
-                        vector_blob=None,
-                        vector_dim=0,
-                        model_name='tesseract-ocr'
-                    )
-                logger.info(f"Created new page embedding for page {page_number}")
-            except Exception as emb_error:
-                logger.warning(f"Failed to generate embedding: {emb_error}")
-                PageEmbedding.create(
-                    paper=paper,
-                    page_number=page_number,
-                    page_text=selected_text,
-                    vector_blob=None,
-                    vector_dim=0,
-                    model_name='tesseract-ocr'
-                )
+        # Upsert the page: the text is always replaced, the vector only when
+        # a new one was generated
+        preserve = [PageEmbedding.page_text]
+        if new_embedding is not None:
+            preserve += [PageEmbedding.vector_blob, PageEmbedding.vector_dim,
+                         PageEmbedding.vector_scale, PageEmbedding.model_name]
+        (PageEmbedding
+         .insert(_page_embedding_row(doc_id, page_number, selected_text, new_embedding))
+         .on_conflict(conflict_target=PAGE_EMBEDDING_KEY, preserve=preserve)
+         .execute())
+        logger.info(f"Saved page embedding for page {page_number}")
         
         result = {
             "success": True,
@@ -2245,12 +2517,10 @@ async def apply_ocr_result(
 @router.post("/papers/{doc_id}/full-ocr")
 async def full_document_ocr(
     doc_id: str,
-    background_tasks: BackgroundTasks,
     user: AdminUser = Depends(require_auth)
 ):
     """Re-OCR entire document with Tesseract"""
     try:
-        from models import Paper, PageEmbedding
         from ocr import process_pdf_with_ocr, detect_language_hybrid
         import os
         import asyncio
@@ -2279,8 +2549,11 @@ async def full_document_ocr(
             current_step='Starting full document ReOCR'
         )
         
-        # Start background task using FastAPI BackgroundTasks
-        background_tasks.add_task(process_full_document_ocr_task, paper, processing_job)
+        # Run on the dedicated OCR executor rather than Starlette's shared
+        # threadpool; the task reloads its rows from these ids
+        asyncio.get_running_loop().run_in_executor(
+            _FULL_OCR_EXECUTOR, process_full_document_ocr_task, doc_id, processing_job.job_id
+        )
         
         return {
             "success": True,
@@ -2297,26 +2570,49 @@ async def full_document_ocr(
         raise HTTPException(status_code=500, detail=f"Failed to start full document OCR: {str(e)}")
 
 
-def process_full_document_ocr_task(paper, processing_job=None):
+# Metadata columns refreshed from re-extracted metadata after full-document OCR
+REOCR_METADATA_FIELDS = (
+    Metadata.title, Metadata.authors, Metadata.abstract, Metadata.keywords,
+    Metadata.doi, Metadata.journal, Metadata.year
+)
+
+
+# Full-document OCR jobs get their own small pool so long runs neither block
+# the event loop nor hold Starlette's threadpool used by sync handlers
+_FULL_OCR_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv('FULL_OCR_JOB_WORKERS', '2')),
+    thread_name_prefix='full-ocr'
+)
+
+
+def _update_job_progress(processing_job, step: str, percentage: int):
+    """Write only the progress columns of a job; no-op without a job"""
+    if processing_job is None:
+        return
+    (ProcessingJob
+     .update(current_step=step, progress_percentage=percentage)
+     .where(ProcessingJob.job_id == processing_job.job_id)
+     .execute())
+
+
+def process_full_document_ocr_task(doc_id: str, job_id: Optional[str] = None):
     """Background task for full document OCR processing with PDF text layer regeneration"""
+    processing_job = None
     try:
-        # Ensure database connection for background task
-        if db.is_closed():
-            db.connect()
+        # Runs on a long-lived executor thread; peewee connections are
+        # per-thread, so reuse this thread's connection across tasks
+        if db.connect(reuse_if_open=True):
             logger.info("Database connection opened for background task")
         
+        paper = Paper.get(Paper.doc_id == doc_id)
+        if job_id:
+            processing_job = ProcessingJob.get_or_none(ProcessingJob.job_id == job_id)
+        
         if processing_job:
             processing_job.started_at = datetime.now()
-            processing_job.save()
-        from ocr import (extract_page_texts_from_pdf, perform_page_ocr_with_tesseract, 
-                        detect_language_hybrid, regenerate_pdf_text_layer)
-        from models import PageEmbedding
-        from embedding import generate_text_embedding
-        import os
-        import tempfile
+            processing_job.save(only=[ProcessingJob.started_at])
         
         pdf_path = paper.file_path
-        doc_id = paper.doc_id  # Store doc_id for later use
         logger.info(f"Processing full document OCR for {doc_id}")
         logger.info(f"PDF path: {pdf_path}")
         
@@ -2326,10 +2622,7 @@ def process_full_document_ocr_task(paper, processing_job=None):
             raise Exception(f"PDF file not found: {pdf_path}")
         
         # Update progress
-        if processing_job:
-            processing_job.current_step = 'Detecting language'
-            processing_job.progress_percentage = 5
-            processing_job.save()
+        _update_job_progress(processing_job, 'Detecting language', 5)
         
         # Detect language
         tesseract_lang = detect_language_hybrid(pdf_path)
@@ -2340,90 +2633,72 @@ def process_full_document_ocr_task(paper, processing_job=None):
         
         # Step 1: Process individual pages for database updates
         logger.info("Step 1: Processing individual pages...")
-        if processing_job:
-            processing_job.current_step = f'Processing pages (0/{total_pages})'
-            processing_job.progress_percentage = 10
-            processing_job.save()
+        _update_job_progress(processing_job, f'Processing pages (0/{total_pages})', 10)
         
         successful_pages = 0
-        
-        for page_num in range(1, total_pages + 1):
-            try:
-                # Perform OCR on each page
-                extracted_text, confidence = perform_page_ocr_with_tesseract(
-                    pdf_path, page_num, tesseract_lang
-                )
-                
-                if extracted_text:
-                    # Update or create page embedding
-                    try:
-                        page_embedding = PageEmbedding.get(
-                            (PageEmbedding.paper == paper) & 
-                            (PageEmbedding.page_number == page_num)
-                        )
-                        page_embedding.page_text = extracted_text
-                        page_embedding.save()
-                    except PageEmbedding.DoesNotExist:
-                        # Generate embedding
-                        try:
-                            embedding_vector = generate_text_embedding(extracted_text)
-                            if embedding_vector is not None:
-                                import numpy as np
-                                vector_array = np.array(embedding_vector, dtype=np.float32)
-                                PageEmbedding.create(
-                                    paper=paper,
-                                    page_number=page_num,
-                                    page_text=extracted_text,
-                                    vector_blob=vector_array.tobytes(),
-                                    vector_dim=len(embedding_vector),
-                                    model_name='bge-m3'
-                                )
-                            else:
-                                PageEmbedding.create(
-                                    paper=paper,
-                                    page_number=page_num,
-                                    page_text=extracted_text,
-                                    vector_blob=None,
-                                    vector_dim=0,
-                                    model_name='tesseract-ocr'
-                                )
-                        except Exception as emb_error:
-                            logger.warning(f"Failed to generate embedding for page {page_num}: {emb_error}")
-                            PageEmbedding.create(
-                                paper=paper,
-                                page_number=page_num,
-                                page_text=extracted_text,
-                                vector_blob=None,
-                                vector_dim=0,
-                                model_name='tesseract-ocr'
-                            )
-                    
-                    successful_pages += 1
-                    logger.info(f"Processed page {page_num}/{total_pages}")
-                    
-                    # Update progress
-                    if processing_job:
-                        progress = 10 + (page_num / total_pages) * 50  # Pages take 50% of progress (10-60%)
-                        processing_job.current_step = f'Processing pages ({page_num}/{total_pages})'
-                        processing_job.progress_percentage = int(progress)
-                        processing_job.save()
+        ocr_results = []
+        
+        # OCR pages in parallel. Each page's Tesseract run is its own process
+        # (single OpenMP thread), so threads supply the parallelism without
+        # forking the model-holding process; only the short in-process
+        # PyMuPDF render is serialised. DB writes stay on this thread.
+        max_workers = max(1, min(total_pages, int(os.getenv('OCR_PAGE_WORKERS', os.cpu_count() or 1))))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(perform_page_ocr_with_tesseract, pdf_path, page_num, tesseract_lang): page_num
+                for page_num in range(1, total_pages + 1)
+            }
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                page_num = futures[future]
+                try:
+                    extracted_text, confidence = future.result()
                     
-            except Exception as page_error:
-                logger.error(f"Error processing page {page_num}: {page_error}")
-                # Check if it's a database lock and retry once
-                if "database is locked" in str(page_error).lower():
-                    try:
-                        import time
-                        time.sleep(1)  # Wait 1 second and retry
-                        # Re-establish database connection
-                        if db.is_closed():
-                            db.connect()
-                        # Try the operation again (simplified)
-                        logger.info(f"Retrying page {page_num} after database lock")
+                    if extracted_text:
+                        ocr_results.append((page_num, extracted_text))
                         successful_pages += 1
-                    except Exception as retry_error:
-                        logger.error(f"Retry failed for page {page_num}: {retry_error}")
-                continue
+                        logger.info(f"Processed page {page_num}/{total_pages}")
+                        
+                except Exception as page_error:
+                    logger.error(f"Error processing page {page_num}: {page_error}")
+                
+                # Update progress every few pages; each write is its own commit
+                if done_count % 5 == 0 or done_count == total_pages:
+                    progress = 10 + (done_count / total_pages) * 50  # Pages take 50% of progress (10-60%)
+                    _update_job_progress(processing_job, f'Processing pages ({done_count}/{total_pages})', int(progress))
+        
+        ocr_results.sort()
+        
+        # Only pages without a row need a fresh embedding; existing rows keep
+        # their vector and just take the new text
+        existing_pages = {
+            row[0] for row in
+            PageEmbedding.select(PageEmbedding.page_number)
+            .where(PageEmbedding.paper == paper)
+            .tuples()
+        }
+        missing_pages = [(page_num, text) for page_num, text in ocr_results if page_num not in existing_pages]
+        
+        # Embed all new pages in batches rather than one model call per page
+        new_vectors = {}
+        if missing_pages:
+            try:
+                embedding_vectors = generate_page_embeddings([text for _, text in missing_pages])
+                new_vectors = {page_num: vector for (page_num, _), vector in zip(missing_pages, embedding_vectors)}
+            except Exception as emb_error:
+                logger.warning(f"Failed to generate page embeddings: {emb_error}")
+        
+        # Write all page results in one transaction with a single upsert per
+        # batch; on conflict only the text is replaced
+        rows = [
+            _page_embedding_row(paper.doc_id, page_num, extracted_text, new_vectors.get(page_num))
+            for page_num, extracted_text in ocr_results
+        ]
+        with db.atomic():
+            for batch in chunked(rows, 100):
+                (PageEmbedding
+                 .insert_many(batch)
+                 .on_conflict(conflict_target=PAGE_EMBEDDING_KEY, preserve=[PageEmbedding.page_text])
+                 .execute())
         
         # Step 2: Regenerate PDF text layer if most pages were successful
         success_rate = successful_pages / total_pages if total_pages > 0 else 0
@@ -2431,10 +2706,7 @@ def process_full_document_ocr_task(paper, processing_job=None):
         
         if success_rate >= 0.7:  # If 70% or more pages were successful
             logger.info("Step 2: Regenerating PDF text layer with ocrmypdf...")
-            if processing_job:
-                processing_job.current_step = 'Regenerating PDF text layer'
-                processing_job.progress_percentage = 65
-                processing_job.save()
+            _update_job_progress(processing_job, 'Regenerating PDF text layer', 65)
             
             # Create temporary path for new PDF
             pdf_dir = os.path.dirname(pdf_path)
@@ -2451,33 +2723,25 @@ def process_full_document_ocr_task(paper, processing_job=None):
                 )
                 
                 if result['success']:
-                    # Replace original PDF with new one
-                    import shutil
-                    shutil.move(temp_pdf_path, pdf_path)
+                    # Replace original PDF with new one; the temp file is in
+                    # the same directory, so this is an atomic rename
+                    os.replace(temp_pdf_path, pdf_path)
                     
                     logger.info(f"PDF text layer regenerated successfully for {paper.doc_id}")
                     logger.info(f"Original PDF backed up to: {result['backup_path']}")
                     
-                    # Refresh paper object from database to avoid stale data
-                    try:
-                        paper = Paper.get(Paper.doc_id == doc_id)
-                    except Paper.DoesNotExist:
-                        logger.error(f"Paper {doc_id} not found in database after OCR")
-                        return
-                    except Exception as e:
-                        logger.error(f"Error refreshing paper object: {e}")
-                        # Try to get by doc_id instead
-                        try:
-                            paper = Paper.select().where(Paper.doc_id == doc_id).get()
-                        except:
-                            logger.error(f"Failed to refresh paper object for {doc_id}")
-                            return
-                    
-                    # Update paper record to indicate text layer was regenerated
-                    paper.processing_notes = (paper.processing_notes or '') + f"\nText layer regenerated with Tesseract ({tesseract_lang}) on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                    paper.original_file_path = result['backup_path']
-                    paper.ocr_regenerated = True
-                    paper.save()
+                    # Update paper record to indicate text layer was regenerated;
+                    # a targeted UPDATE appends to the current notes in SQL, so
+                    # no refresh of the row is needed first
+                    note_text = f"\nText layer regenerated with Tesseract ({tesseract_lang}) on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                    (Paper
+                     .update({
+                         Paper.processing_notes: fn.COALESCE(Paper.processing_notes, '').concat(note_text),
+                         Paper.original_file_path: result['backup_path'],
+                         Paper.ocr_regenerated: True
+                     })
+                     .where(Paper.doc_id == doc_id)
+                     .execute())
                     logger.info(f"Paper record updated for {paper.doc_id}")
                     
                 else:
@@ -2486,62 +2750,79 @@ def process_full_document_ocr_task(paper, processing_job=None):
             except Exception as pdf_error:
                 logger.error(f"Error during PDF text layer regeneration: {pdf_error}")
                 # Clean up temp file if it exists
-                if os.path.exists(temp_pdf_path):
-                    os.unlink(temp_pdf_path)
+                Path(temp_pdf_path).unlink(missing_ok=True)
         else:
             logger.warning(f"Skipping PDF text layer regeneration due to low success rate: {success_rate:.2%}")
         
         # Step 3: Update document-level embedding with combined text from all pages
         logger.info("Step 3: Updating document-level embedding...")
-        if processing_job:
-            processing_job.current_step = 'Updating document embedding'
-            processing_job.progress_percentage = 80
-            processing_job.save()
+        _update_job_progress(processing_job, 'Updating document embedding', 80)
         try:
-            from models import Embedding
-            from embedding import generate_text_embedding
-            
-            # Collect all page texts
-            page_embeddings = PageEmbedding.select().where(
-                PageEmbedding.paper == paper
-            ).order_by(PageEmbedding.page_number)
+            # Stream page texts without building model instances
+            page_rows = (PageEmbedding
+                         .select(PageEmbedding.page_number, PageEmbedding.page_text)
+                         .where(PageEmbedding.paper == paper)
+                         .order_by(PageEmbedding.page_number)
+                         .dicts()
+                         .iterator())
             
-            combined_text = ""
-            first_pages_text = ""  # For metadata extraction
-            for i, page_emb in enumerate(page_embeddings):
-                if page_emb.page_text:
-                    combined_text += page_emb.page_text + "\n\n"
+            text_parts = []
+            first_pages_parts = []  # For metadata extraction
+            for i, row in enumerate(page_rows):
+                if row['page_text']:
+                    text_parts.append(row['page_text'])
                     # Collect first 2 pages for metadata extraction
                     if i < 2:
-                        first_pages_text += page_emb.page_text + "\n\n"
+                        first_pages_parts.append(row['page_text'])
             
-            if combined_text.strip():
-                # Generate document-level embedding
-                doc_embedding_vector = generate_text_embedding(combined_text.strip())
+            combined_text = "".join(part + "\n\n" for part in text_parts)
+            first_pages_text = "".join(part + "\n\n" for part in first_pages_parts)
+            
+            document_text = combined_text.strip()
+            if document_text:
+                text_hash = hashlib.sha256(document_text.encode('utf-8')).hexdigest()
+                doc_embedding = Embedding.get_or_none(Embedding.paper == paper)
                 
-                if doc_embedding_vector is not None:
-                    import numpy as np
-                    vector_array = np.array(doc_embedding_vector, dtype=np.float32)
+                if (doc_embedding is not None and doc_embedding.text_hash == text_hash
+                        and doc_embedding.model_name == 'bge-m3' and doc_embedding.vector_blob):
+                    logger.info(f"Document text unchanged for {paper.doc_id}; keeping existing document embedding")
+                else:
+                    # Reuse a stored vector for identical text before running the model
+                    cached = (Embedding
+                              .select(Embedding.vector_blob, Embedding.vector_dim)
+                              .where((Embedding.text_hash == text_hash) &
+                                     (Embedding.model_name == 'bge-m3') &
+                                     (fn.LENGTH(Embedding.vector_blob) > 0))
+                              .first())
+                    if cached is not None:
+                        vector_blob, vector_dim = cached.vector_blob, cached.vector_dim
+                        logger.info(f"Reusing cached document embedding for {paper.doc_id}")
+                    else:
+                        doc_embedding_vector = generate_text_embedding(document_text)
+                        if doc_embedding_vector is None:
+                            vector_blob = None
+                        else:
+                            # Already a float32 ndarray; serialize its buffer as is
+                            vector_blob, vector_dim = doc_embedding_vector.tobytes(), doc_embedding_vector.shape[0]
                     
-                    # Update or create document embedding
-                    try:
-                        doc_embedding = Embedding.get(Embedding.paper == paper)
-                        doc_embedding.vector_blob = vector_array.tobytes()
-                        doc_embedding.vector_dim = len(doc_embedding_vector)
+                    if vector_blob is None:
+                        logger.warning(f"Failed to generate document-level embedding for {paper.doc_id}")
+                    elif doc_embedding is not None:
+                        doc_embedding.vector_blob = vector_blob
+                        doc_embedding.vector_dim = vector_dim
                         doc_embedding.model_name = 'bge-m3'
-                        doc_embedding.updated_at = datetime.now()
+                        doc_embedding.text_hash = text_hash
                         doc_embedding.save()
                         logger.info(f"Updated document-level embedding for {paper.doc_id}")
-                    except Embedding.DoesNotExist:
+                    else:
                         Embedding.create(
                             paper=paper,
-                            vector_blob=vector_array.tobytes(),
-                            vector_dim=len(doc_embedding_vector),
-                            model_name='bge-m3'
+                            vector_blob=vector_blob,
+                            vector_dim=vector_dim,
+                            model_name='bge-m3',
+                            text_hash=text_hash
                         )
                         logger.info(f"Created new document-level embedding for {paper.doc_id}")
-                else:
-                    logger.warning(f"Failed to generate document-level embedding for {paper.doc_id}")
             else:
                 logger.warning(f"No text available for document-level embedding for {paper.doc_id}")
                 
@@ -2550,15 +2831,8 @@ def process_full_document_ocr_task(paper, processing_job=None):
         
         # Step 4: Re-extract metadata from improved OCR text
         logger.info("Step 4: Re-extracting paper metadata from improved OCR text...")
-        if processing_job:
-            processing_job.current_step = 'Re-extracting metadata'
-            processing_job.progress_percentage = 90
-            processing_job.save()
+        _update_job_progress(processing_job, 'Re-extracting metadata', 90)
         try:
-            from metadata import extract_paper_metadata
-            from models import Metadata
-            from ocr import extract_first_pages_with_formatting
-            
             # Try to get formatted text with font sizes first
             formatted_text = None
             try:
@@ -2582,62 +2856,26 @@ def process_full_document_ocr_task(paper, processing_job=None):
                 metadata_info, success = extract_paper_metadata(metadata_text)
                 
                 if success and metadata_info:
+                    # Only non-empty extracted values replace stored ones;
+                    # list values are stored as JSON like save_metadata does
+                    changed = {}
+                    for field in REOCR_METADATA_FIELDS:
+                        value = metadata_info.get(field.name)
+                        if value:
+                            changed[field] = json.dumps(value) if isinstance(value, list) else value
                     
-                    # Update or create metadata record
-                    try:
-                        metadata_record = Metadata.get(Metadata.paper == paper)
-                        
-                        # Update with new extracted information
-                        if metadata_info.get('title'):
-                            metadata_record.title = metadata_info['title']
-                        if metadata_info.get('authors'):
-                            metadata_record.authors = metadata_info['authors']
-                        if metadata_info.get('abstract'):
-                            metadata_record.abstract = metadata_info['abstract']
-                        if metadata_info.get('keywords'):
-                            metadata_record.keywords = metadata_info['keywords']
-                        if metadata_info.get('doi'):
-                            metadata_record.doi = metadata_info['doi']
-                        if metadata_info.get('journal'):
-                            metadata_record.journal = metadata_info['journal']
-                        if metadata_info.get('year'):
-                            metadata_record.year = metadata_info['year']
-                        if metadata_info.get('volume'):
-                            metadata_record.volume = metadata_info['volume']
-                        if metadata_info.get('issue'):
-                            metadata_record.issue = metadata_info['issue']
-                        if metadata_info.get('pages'):
-                            metadata_record.pages = metadata_info['pages']
-                        
-                        # Update extraction info
-                        metadata_record.extraction_method = 'tesseract_reocr'
-                        metadata_record.confidence_score = metadata_info.get('confidence_score', 0.8)  # Default confidence for ReOCR
-                        metadata_record.updated_at = datetime.now()
-                        metadata_record.save()
-                        
-                        logger.info(f"Updated metadata for {paper.doc_id} with ReOCR results")
-                        logger.info(f"Extracted title: {metadata_info.get('title', 'N/A')[:100]}")
-                        logger.info(f"Extracted authors: {metadata_info.get('authors', 'N/A')[:100]}")
-                        logger.info(f"Metadata extraction used {len(metadata_text)} chars from {'first 2 pages' if first_pages_text.strip() else 'all pages'}")
-                        
-                    except Metadata.DoesNotExist:
-                        # Create new metadata record
-                        Metadata.create(
-                            paper=paper,
-                            title=metadata_info.get('title', ''),
-                            authors=metadata_info.get('authors', ''),
-                            abstract=metadata_info.get('abstract', ''),
-                            keywords=metadata_info.get('keywords', ''),
-                            doi=metadata_info.get('doi', ''),
-                            journal=metadata_info.get('journal', ''),
-                            year=metadata_info.get('year'),
-                            volume=metadata_info.get('volume', ''),
-                            issue=metadata_info.get('issue', ''),
-                            pages=metadata_info.get('pages', ''),
-                            extraction_method='tesseract_reocr',
-                            confidence_score=metadata_info.get('confidence_score', 0.8)  # Default confidence for ReOCR
-                        )
-                        logger.info(f"Created new metadata for {paper.doc_id} with ReOCR results")
+                    # Single upsert: insert a new record or update only the
+                    # changed columns of the existing one
+                    if changed:
+                        (Metadata
+                         .insert({Metadata.paper: doc_id, **changed})
+                         .on_conflict(conflict_target=[Metadata.paper], update=changed)
+                         .execute())
+                    
+                    logger.info(f"Saved metadata for {paper.doc_id} with ReOCR results")
+                    logger.info(f"Extracted title: {metadata_info.get('title', 'N/A')[:100]}")
+                    logger.info(f"Extracted authors: {metadata_info.get('authors', 'N/A')[:100]}")
+                    logger.info(f"Metadata extraction used {len(metadata_text)} chars from {'first 2 pages' if first_pages_text.strip() else 'all pages'}")
                 else:
                     logger.warning(f"Failed to extract metadata from ReOCR text for {paper.doc_id}")
                     logger.info(f"Metadata extraction used {len(metadata_text)} chars from {'first pages' if first_pages_text.strip() else 'all pages'}")
@@ -2647,6 +2885,7 @@ def process_full_document_ocr_task(paper, processing_job=None):
         except Exception as meta_error:
             logger.error(f"Failed to re-extract metadata for {paper.doc_id}: {meta_error}")
         
+        invalidate_stats_cache()
         logger.info(f"Full document OCR completed for {paper.doc_id}")
         
         # Mark job as completed
@@ -2663,7 +2902,7 @@ def process_full_document_ocr_task(paper, processing_job=None):
             processing_job.save()
         
     except Exception as e:
-        logger.error(f"Full document OCR task failed for {paper.doc_id}: {e}")
+        logger.error(f"Full document OCR task failed for {doc_id}: {e}")
         
         # Mark job as failed
         if processing_job:
@@ -2675,6 +2914,10 @@ def process_full_document_ocr_task(paper, processing_job=None):
             processing_job.save()
 
 
+# Matches each "Text layer regenerated" line in Paper.processing_notes
+_TEXT_LAYER_NOTE_RE = re.compile(r'^.*Text layer regenerated.*$', re.MULTILINE)
+
+
 @router.get("/ocr-status", response_class=HTMLResponse)
 async def admin_ocr_status(
     request: Request,
@@ -2682,39 +2925,38 @@ async def admin_ocr_status(
 ):
     """OCR processing status dashboard"""
     try:
-        from models import Paper, PageEmbedding
-        from peewee import fn
-        
-        # Get papers with processing notes
-        papers_with_notes = (Paper
-                           .select()
-                           .where(Paper.processing_notes.is_null(False))
-                           .order_by(Paper.updated_at.desc())
-                           .limit(20))
+        # Get papers with processing notes (only the columns the page shows)
+        papers_with_notes = list(Paper
+                                 .select(Paper.doc_id, Paper.filename, Paper.updated_at, Paper.processing_notes)
+                                 .where(Paper.processing_notes.is_null(False))
+                                 .order_by(Paper.updated_at.desc())
+                                 .limit(20)
+                                 .dicts())
         
         # Get OCR completion statistics
-        total_papers = Paper.select().count()
+        total_papers = _cached_stats()["total_papers"]
         papers_with_text_layer = (Paper
                                 .select()
                                 .where(Paper.processing_notes.contains('Text layer regenerated'))
                                 .count())
         
-        # Get recent OCR activities
-        recent_activities = []
-        for paper in papers_with_notes:
-            if paper.processing_notes:
-                lines = paper.processing_notes.strip().split('\n')
-                for line in lines:
-                    if 'Text layer regenerated' in line:
-                        recent_activities.append({
-                            'paper': paper,
-                            'activity': line.strip(),
-                            'timestamp': paper.updated_at
-                        })
-        
-        # Sort by timestamp
-        recent_activities.sort(key=lambda x: x['timestamp'], reverse=True)
-        recent_activities = recent_activities[:10]
+        # Get recent OCR activities; SQL filters to papers that have one and
+        # the regex pulls out just the matching lines
+        regenerated_papers = (Paper
+                              .select(Paper.doc_id, Paper.filename, Paper.updated_at, Paper.processing_notes)
+                              .where(Paper.processing_notes.contains('Text layer regenerated'))
+                              .order_by(Paper.updated_at.desc())
+                              .limit(10)
+                              .dicts())
+        recent_activities = [
+            {
+                'paper': paper,
+                'activity': line.strip(),
+                'timestamp': paper['updated_at']
+            }
+            for paper in regenerated_papers
+            for line in _TEXT_LAYER_NOTE_RE.findall(paper['processing_notes'])
+        ][:10]
         
         # Get page-level OCR statistics
         page_stats = (PageEmbedding
@@ -2733,10 +2975,10 @@ async def admin_ocr_status(
             {
                 "request": request,
                 "user": user,
-                "papers_with_notes": list(papers_with_notes),
+                "papers_with_notes": papers_with_notes,
                 "recent_activities": recent_activities,
                 "ocr_stats": ocr_stats,
-                "version": get_version()
+                "version": APP_VERSION
             }
         )
         
@@ -2752,28 +2994,25 @@ async def download_original_pdf(
 ):
     """Download original PDF before OCR regeneration"""
     try:
-        from models import Paper
-        from fastapi.responses import FileResponse
-        import os
-        
-        # Get paper info
-        try:
-            paper = Paper.get(Paper.doc_id == doc_id)
-        except Paper.DoesNotExist:
-            raise HTTPException(status_code=404, detail=f"Paper not found: {doc_id}")
+        paper = _get_paper_fields(doc_id, Paper.filename, Paper.original_file_path)
         
         # Check if original file exists
         if not paper.original_file_path:
             raise HTTPException(status_code=404, detail="No original file backup available")
         
-        if not os.path.exists(paper.original_file_path):
+        # Stat off the event loop; the result is handed to the response so it
+        # does not stat the file again
+        try:
+            stat_result = await asyncio.to_thread(os.stat, paper.original_file_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Original file not found on disk")
         
         # Return file
-        return FileResponse(
+        return LargeFileResponse(
             paper.original_file_path,
             media_type='application/pdf',
-            filename=f"original_{paper.filename}"
+            filename=f"original_{paper.filename}",
+            stat_result=stat_result
         )
         
     except HTTPException:
@@ -2802,7 +3041,6 @@ async def admin_pending_tasks(
         from ocr_quality import is_quality_assessment_available
         from layout import is_layout_service_available
         from metadata import is_metadata_service_available
-        from gpu_monitor import get_gpu_monitor
         
         services = {
             'llava': is_quality_assessment_available(),
@@ -2811,29 +3049,32 @@ async def admin_pending_tasks(
         }
         
         # Get GPU and Ollama status
-        gpu_monitor = get_gpu_monitor()
-        gpu_status = gpu_monitor.get_comprehensive_status()
-        
-        # Count pending tasks
-        pending_counts = {
-            'ocr_quality': Paper.select().where(
-                (Paper.ocr_quality_completed == False) | 
-                (Paper.ocr_quality.is_null(True))
-            ).count(),
-            'layout': Paper.select().where(Paper.layout_completed == False).count(),
-            'metadata_llm': Paper.select().where(
-                (Paper.metadata_llm_completed == False) &
-                (Paper.ocr_text.is_null(False)) &
-                (Paper.ocr_text != '')
-            ).count()
-        }
-        
-        # Get papers with any pending tasks
-        papers_with_pending = Paper.select().where(
-            (Paper.ocr_quality_completed == False) |
-            (Paper.layout_completed == False) |
-            (Paper.metadata_llm_completed == False)
-        ).order_by(Paper.created_at.desc()).limit(50)
+        gpu_status = await _gpu_status_cached()
+        
+        # Count pending tasks in a single pass over the paper table
+        pending_counts = (Paper
+                          .select(
+                              fn.COALESCE(fn.SUM(Case(None, [(
+                                  (Paper.ocr_quality_completed == False) |
+                                  (Paper.ocr_quality.is_null(True)), 1)], 0)), 0).alias('ocr_quality'),
+                              fn.COALESCE(fn.SUM(Case(None, [(
+                                  Paper.layout_completed == False, 1)], 0)), 0).alias('layout'),
+                              fn.COALESCE(fn.SUM(Case(None, [(
+                                  (Paper.metadata_llm_completed == False) &
+                                  (Paper.ocr_text.is_null(False)) &
+                                  (Paper.ocr_text != ''), 1)], 0)), 0).alias('metadata_llm'))
+                          .dicts()
+                          .get())
+        
+        # Get papers with any pending tasks (only the columns the table shows)
+        papers_with_pending = list(Paper
+                                   .select(Paper.doc_id, Paper.filename, Paper.created_at,
+                                           Paper.ocr_quality_completed, Paper.layout_completed,
+                                           Paper.metadata_llm_completed)
+                                   .where(SQL(PAPER_PENDING_CONDITION))
+                                   .order_by(Paper.created_at.desc())
+                                   .limit(50)
+                                   .dicts())
         
         return templates.TemplateResponse("pending_tasks.html", {
             "request": request,
@@ -2843,7 +3084,7 @@ async def admin_pending_tasks(
             "pending_counts": pending_counts,
             "papers_with_pending": papers_with_pending,
             "gpu_status": gpu_status,
-            "version": get_version()
+            "version": APP_VERSION
         })
         
     except Exception as e:
@@ -2945,60 +3186,69 @@ async def process_single_paper_pending(
         from layout import analyze_pdf_layout
         from metadata import extract_paper_metadata
         from db import save_layout_analysis, save_metadata
-        from pdf2image import convert_from_path
+        from ocr import render_pdf_page
         import tempfile
         
-        tasks_processed = []
+        # Each step calls a different service and sets only its own
+        # completion column, so the steps run concurrently in worker threads
+        def mark_completed(**columns):
+            Paper.update(**columns).where(Paper.doc_id == doc_id).execute()
+        
+        def run_ocr_quality():
+            # The quality assessor reads the image from a path
+            with tempfile.TemporaryDirectory() as temp_dir:
+                first_page = render_pdf_page(paper.file_path, 1, dpi=200)
+                if first_page is not None:
+                    first_page_path = os.path.join(temp_dir, "first_page.png")
+                    first_page.save(first_page_path, "PNG")
+                    quality_summary, _ = assess_document_quality(first_page_path)
+                    mark_completed(ocr_quality=quality_summary, ocr_quality_completed=True)
+                    return "ocr_quality"
+        
+        def run_layout():
+            layout_data, layout_success = analyze_pdf_layout(paper.file_path)
+            if layout_success:
+                page_count = layout_data.get('page_count', 0)
+                save_layout_analysis(paper.doc_id, layout_data, page_count)
+                mark_completed(layout_completed=True)
+                return "layout"
+        
+        def run_metadata():
+            metadata, metadata_success = extract_paper_metadata(paper.ocr_text)
+            if metadata_success and metadata.get('extraction_method') in ['structured_llm', 'simple_llm']:
+                save_metadata(
+                    paper.doc_id,
+                    title=metadata.get('title'),
+                    authors=metadata.get('authors'),
+                    journal=metadata.get('journal'),
+                    year=metadata.get('year'),
+                    doi=metadata.get('doi'),
+                    abstract=metadata.get('abstract'),
+                    keywords=metadata.get('keywords')
+                )
+                mark_completed(metadata_llm_completed=True)
+                return "metadata_llm"
         
-        # Process OCR quality if pending
+        # Queue only the tasks still pending for this paper
+        steps = []
         if not paper.ocr_quality_completed:
-            try:
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    images = convert_from_path(paper.file_path, first_page=1, last_page=1, dpi=200)
-                    if images:
-                        first_page_path = os.path.join(temp_dir, "first_page.png")
-                        images[0].save(first_page_path, "PNG")
-                        quality_summary, _ = assess_document_quality(first_page_path)
-                        paper.ocr_quality = quality_summary
-                        paper.ocr_quality_completed = True
-                        paper.save()
-                        tasks_processed.append("ocr_quality")
-            except Exception as e:
-                logger.error(f"Error processing OCR quality: {e}")
-        
-        # Process layout if pending
+            steps.append(("OCR quality", run_ocr_quality))
         if not paper.layout_completed:
-            try:
-                layout_data, layout_success = analyze_pdf_layout(paper.file_path)
-                if layout_success:
-                    page_count = layout_data.get('page_count', 0)
-                    save_layout_analysis(paper.doc_id, layout_data, page_count)
-                    paper.layout_completed = True
-                    paper.save()
-                    tasks_processed.append("layout")
-            except Exception as e:
-                logger.error(f"Error processing layout: {e}")
-        
-        # Process metadata if pending
+            steps.append(("layout", run_layout))
         if not paper.metadata_llm_completed and paper.ocr_text:
-            try:
-                metadata, metadata_success = extract_paper_metadata(paper.ocr_text)
-                if metadata_success and metadata.get('extraction_method') in ['structured_llm', 'simple_llm']:
-                    save_metadata(
-                        paper.doc_id,
-                        title=metadata.get('title'),
-                        authors=metadata.get('authors'),
-                        journal=metadata.get('journal'),
-                        year=metadata.get('year'),
-                        doi=metadata.get('doi'),
-                        abstract=metadata.get('abstract'),
-                        keywords=metadata.get('keywords')
-                    )
-                    paper.metadata_llm_completed = True
-                    paper.save()
-                    tasks_processed.append("metadata_llm")
-            except Exception as e:
-                logger.error(f"Error processing metadata: {e}")
+            steps.append(("metadata", run_metadata))
+        
+        results = await asyncio.gather(
+            *(asyncio.to_thread(step) for _, step in steps),
+            return_exceptions=True
+        )
+        
+        tasks_processed = []
+        for (label, _), result in zip(steps, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing {label}: {result}")
+            elif result:
+                tasks_processed.append(result)
         
         return {
             "success": True,
@@ -3016,10 +3266,7 @@ async def get_gpu_status(
 ):
     """Get real-time GPU and Ollama status"""
     try:
-        from gpu_monitor import get_gpu_monitor
-        
-        gpu_monitor = get_gpu_monitor()
-        gpu_status = gpu_monitor.get_comprehensive_status()
+        gpu_status = await _gpu_status_cached()
         
         return {
             "success": True,
@@ -1,26 +1,102 @@
 import bcrypt
 import datetime
+import hashlib
+import hmac
 import logging
+import os
+import secrets
+import threading
+from collections import OrderedDict
 from typing import Optional
+from peewee import IntegrityError
 from models import AdminUser
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerifyMismatchError
+except ImportError:
+    PasswordHasher = None
+
 logger = logging.getLogger(__name__)
 
+# New hashes use argon2id when argon2-cffi is installed; bcrypt hashes
+# still verify and are upgraded on the next successful login
+_password_hasher = (PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+                    if PasswordHasher is not None else None)
+
+# bcrypt cost factor for new hashes without argon2; dev/test deployments can lower it
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# last_login is rewritten at most once per this many seconds per user
+LAST_LOGIN_UPDATE_SECONDS = 60
+
+# Successful verifications, keyed by an HMAC of the password under a
+# per-process secret plus the stored hash, so repeat logins skip bcrypt.
+# Raw passwords are never stored, and a password change alters the key.
+VERIFY_CACHE_SIZE = 256
+_VERIFY_CACHE_SECRET = secrets.token_bytes(32)
+_verify_cache: "OrderedDict[tuple, bool]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+
+def _verify_cache_key(password: str, hashed_password: str) -> tuple:
+    """Cache key that identifies a password without storing it"""
+    digest = hmac.new(_VERIFY_CACHE_SECRET, password.encode('utf-8'), hashlib.sha256).digest()
+    return digest, hashed_password
+
 class AuthManager:
     """Admin user authentication manager"""
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash a password using bcrypt"""
-        salt = bcrypt.gensalt()
+        """Hash a password using argon2id, or bcrypt if argon2 is unavailable"""
+        if _password_hasher is not None:
+            return _password_hasher.hash(password)
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
+    @staticmethod
+    def _check_password(password: str, hashed_password: str) -> bool:
+        """Check a password against an argon2 or bcrypt hash"""
+        if hashed_password.startswith('$argon2'):
+            if _password_hasher is None:
+                logger.error("argon2 password hash found but argon2-cffi is not installed")
+                return False
+            try:
+                return _password_hasher.verify(hashed_password, password)
+            except VerifyMismatchError:
+                return False
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """Whether a stored hash should be replaced with a current argon2id hash"""
+        if _password_hasher is None:
+            return False
+        if not hashed_password.startswith('$argon2'):
+            return True
+        return _password_hasher.check_needs_rehash(hashed_password)
+    
     @staticmethod
     def verify_password(password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash"""
+        """Verify a password against its hash, reusing earlier successful checks"""
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+            key = _verify_cache_key(password, hashed_password)
+            with _verify_cache_lock:
+                if key in _verify_cache:
+                    _verify_cache.move_to_end(key)
+                    return True
+            
+            # Only successes are cached, so failed guesses cannot evict them
+            if not AuthManager._check_password(password, hashed_password):
+                return False
+            
+            with _verify_cache_lock:
+                _verify_cache[key] = True
+                if len(_verify_cache) > VERIFY_CACHE_SIZE:
+                    _verify_cache.popitem(last=False)
+            return True
         except Exception as e:
             logger.error(f"Password verification error: {e}")
             return False
@@ -35,9 +111,21 @@ class AuthManager:
             )
             
             if AuthManager.verify_password(password, user.password_hash):
-                # Update last login time
-                user.last_login = datetime.datetime.now()
-                user.save()
+                # Update last login time, skipping the write for rapid re-logins
+                now = datetime.datetime.now()
+                if (user.last_login is None or
+                        (now - user.last_login).total_seconds() > LAST_LOGIN_UPDATE_SECONDS):
+                    user.last_login = now
+                    AdminUser.update(last_login=now).where(AdminUser.id == user.id).execute()
+                
+                # Upgrade legacy bcrypt hashes now that the password is known
+                if AuthManager.needs_rehash(user.password_hash):
+                    user.password_hash = AuthManager.hash_password(password)
+                    (AdminUser
+                     .update(password_hash=user.password_hash)
+                     .where(AdminUser.id == user.id)
+                     .execute())
+                    logger.info(f"Upgraded password hash for user {username}")
                 logger.info(f"User {username} authenticated successfully")
                 return user
             else:
@@ -56,16 +144,6 @@ class AuthManager:
                    full_name: str = None, is_superuser: bool = False) -> Optional[AdminUser]:
         """Create a new admin user"""
         try:
-            # Check if username already exists
-            if AdminUser.select().where(AdminUser.username == username).exists():
-                logger.error(f"Username {username} already exists")
-                return None
-            
-            # Check if email already exists (if provided)
-            if email and AdminUser.select().where(AdminUser.email == email).exists():
-                logger.error(f"Email {email} already exists")
-                return None
-            
             # Hash password
             password_hash = AuthManager.hash_password(password)
             
@@ -82,6 +160,14 @@ class AuthManager:
             logger.info(f"Admin user {username} created successfully")
             return user
             
+        except IntegrityError as e:
+            # UNIQUE constraints on username and email reject duplicates
+            # atomically, so no existence checks run before the INSERT
+            if 'email' in str(e):
+                logger.error(f"Email {email} already exists")
+            else:
+                logger.error(f"Username {username} already exists")
+            return None
         except Exception as e:
             logger.error(f"Error creating user {username}: {e}")
             return None
@@ -90,17 +176,22 @@ class AuthManager:
     def change_password(username: str, old_password: str, new_password: str) -> bool:
         """Change user password"""
         try:
-            user = AdminUser.get(AdminUser.username == username)
+            user = (AdminUser
+                    .select(AdminUser.id, AdminUser.password_hash)
+                    .where(AdminUser.username == username)
+                    .get())
             
             # Verify old password
             if not AuthManager.verify_password(old_password, user.password_hash):
                 logger.warning(f"Invalid old password for user {username}")
                 return False
             
-            # Update password
-            user.password_hash = AuthManager.hash_password(new_password)
-            user.updated_at = datetime.datetime.now()
-            user.save()
+            # Update password; only the changed columns are written
+            (AdminUser
+             .update(password_hash=AuthManager.hash_password(new_password),
+                     updated_at=datetime.datetime.now())
+             .where(AdminUser.id == user.id)
+             .execute())
             
             logger.info(f"Password changed for user {username}")
             return True
@@ -116,17 +207,17 @@ class AuthManager:
     def deactivate_user(username: str) -> bool:
         """Deactivate a user account"""
         try:
-            user = AdminUser.get(AdminUser.username == username)
-            user.is_active = False
-            user.updated_at = datetime.datetime.now()
-            user.save()
+            updated = (AdminUser
+                       .update(is_active=False, updated_at=datetime.datetime.now())
+                       .where(AdminUser.username == username)
+                       .execute())
+            if not updated:
+                logger.error(f"User {username} not found")
+                return False
             
             logger.info(f"User {username} deactivated")
             return True
             
-        except AdminUser.DoesNotExist:
-            logger.error(f"User {username} not found")
-            return False
         except Exception as e:
             logger.error(f"Error deactivating user {username}: {e}")
             return False
@@ -153,7 +244,7 @@ class AuthManager:
         """Ensure default admin user exists"""
         try:
             # Check if any admin users exist
-            if AdminUser.select().count() == 0:
+            if not AdminUser.select().exists():
                 default_user = AuthManager.create_user(
                     username="admin",
                     password="admin123",
@@ -13,7 +13,7 @@ import io
 import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, List, Literal
+from typing import Optional, Dict, List, Literal, Iterator
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
@@ -43,6 +43,7 @@ class SQLiteBackupManager:
         # Backup history file
         self.history_file = self.metadata_dir / "backup_history.json"
         self.history = self._load_history()
+        self._index_history()
         
         # Scheduler for automated backups
         self.scheduler = BackgroundScheduler()
@@ -68,14 +69,28 @@ class SQLiteBackupManager:
         except Exception as e:
             logger.error(f"Failed to save backup history: {e}")
     
+    def _index_history(self):
+        """Rebuild backup_id -> record lookup (first record wins)"""
+        self._history_by_id = {}
+        for backup in self.history:
+            if "backup_id" in backup:
+                self._history_by_id.setdefault(backup["backup_id"], backup)
+    
     def _add_to_history(self, backup_info: Dict):
         """Add backup record to history"""
         self.history.append(backup_info)
         # Keep only last 1000 records
         if len(self.history) > 1000:
             self.history = self.history[-1000:]
+            self._index_history()
+        elif "backup_id" in backup_info:
+            self._history_by_id.setdefault(backup_info["backup_id"], backup_info)
         self._save_history()
     
+    def get_by_id(self, backup_id: str) -> Optional[Dict]:
+        """Get backup record by ID, or None if not in history"""
+        return self._history_by_id.get(backup_id)
+    
     def _setup_scheduled_backups(self):
         """Setup automated backup schedules"""
         # Daily full backup at 3 AM
@@ -339,6 +354,7 @@ class SQLiteBackupManager:
                             logger.info(f"Removed expired backup: {backup_path}")
                         
                         self.history.remove(backup)
+                        self._history_by_id.pop(backup.get("backup_id"), None)
                         removed_count += 1
                     except Exception as e:
                         logger.error(f"Failed to remove backup {backup['path']}: {e}")
@@ -385,6 +401,22 @@ class SQLiteBackupManager:
         """Get backup history with optional limit"""
         return self.history[-limit:][::-1]  # Return most recent first
     
+    def get_dashboard_snapshot(self, history_limit: int = 10) -> Dict:
+        """Get backup status and most recent history records in one call"""
+        return {
+            "status": self.get_backup_status(),
+            "recent": self.get_backup_history(limit=history_limit)
+        }
+    
+    def iter_backup_history(self, offset: int = 0) -> Iterator[Dict]:
+        """Iterate backup history most recent first, skipping the first offset records"""
+        for index in range(len(self.history) - 1 - offset, -1, -1):
+            yield self.history[index]
+    
+    def history_count(self) -> int:
+        """Get number of records in backup history"""
+        return len(self.history)
+    
     def _backup_health_check(self):
         """Scheduled backup health check"""
         try:
@@ -476,11 +508,7 @@ class SQLiteBackupManager:
             Dictionary with restore details
         """
         # Find backup in history
-        backup_info = None
-        for backup in self.history:
-            if backup.get("backup_id") == backup_id:
-                backup_info = backup
-                break
+        backup_info = self.get_by_id(backup_id)
         
         if not backup_info:
             raise ValueError(f"Backup not found: {backup_id}")
@@ -674,16 +702,20 @@ class ChromaDBBackupManager:
             backup_dir = self.chromadb_backup_dir / subdir
             if not backup_dir.exists():
                 continue
-                
-            for backup_file in backup_dir.glob("*.tar*"):
-                file_age = current_time - datetime.fromtimestamp(backup_file.stat().st_mtime)
-                if file_age.days > retention_days:
-                    try:
-                        backup_file.unlink()
-                        removed_count += 1
-                        logger.info(f"Removed old ChromaDB backup: {backup_file}")
-                    except Exception as e:
-                        logger.error(f"Failed to remove backup {backup_file}: {e}")
+            
+            # DirEntry.stat() reuses readdir metadata instead of a fresh Path.stat()
+            with os.scandir(backup_dir) as entries:
+                for entry in entries:
+                    if ".tar" not in entry.name or not entry.is_file(follow_symlinks=False):
+                        continue
+                    file_age = current_time - datetime.fromtimestamp(entry.stat(follow_symlinks=False).st_mtime)
+                    if file_age.days > retention_days:
+                        try:
+                            os.unlink(entry.path)
+                            removed_count += 1
+                            logger.info(f"Removed old ChromaDB backup: {entry.path}")
+                        except Exception as e:
+                            logger.error(f"Failed to remove backup {entry.path}: {e}")
         
         if removed_count > 0:
             logger.info(f"Cleaned up {removed_count} old ChromaDB backups")
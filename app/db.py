@@ -403,8 +403,8 @@ def save_page_embedding(doc_id, page_number, page_text, embedding_vector, model_
             (PageEmbedding.page_number == page_number)
         ).execute()
         
-        # Serialize vector
-        vector_blob = serialize_vector(embedding_vector)
+        # Serialize vector as int8 with its scale
+        vector_blob, vector_scale = serialize_vector_int8(embedding_vector)
         vector_dim = len(embedding_vector)
         
         # Create new page embedding
@@ -414,6 +414,7 @@ def save_page_embedding(doc_id, page_number, page_text, embedding_vector, model_
             page_text=page_text,
             vector_blob=vector_blob,
             vector_dim=vector_dim,
+            vector_scale=vector_scale,
             model_name=model_name
         )
         
@@ -496,7 +497,7 @@ def get_page_embeddings_by_id(doc_id):
         
         result = []
         for page_emb in page_embeddings:
-            embedding_vector = deserialize_vector(page_emb.vector_blob, page_emb.vector_dim)
+            embedding_vector = deserialize_vector(page_emb.vector_blob, page_emb.vector_dim, page_emb.vector_scale)
             result.append((page_emb.page_number, page_emb.page_text, embedding_vector))
         
         return result
@@ -522,7 +523,7 @@ def get_page_embedding_by_page(doc_id, page_number):
             (PageEmbedding.page_number == page_number)
         )
         
-        embedding_vector = deserialize_vector(page_emb.vector_blob, page_emb.vector_dim)
+        embedding_vector = deserialize_vector(page_emb.vector_blob, page_emb.vector_dim, page_emb.vector_scale)
         return page_emb.page_text, embedding_vector
         
     except (Paper.DoesNotExist, PageEmbedding.DoesNotExist):
@@ -6,6 +6,9 @@ from sentence_transformers import SentenceTransformer
 import re
 from typing import List, Optional
 import gc
+import hashlib
+import threading
+from collections import OrderedDict
 from vector_db import get_vector_db
 
 logger = logging.getLogger(__name__)
@@ -37,14 +40,24 @@ class BGEEmbedding:
         
         self.device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
         self.model = None
+        self.tokenizer = None
         self.max_length = 8192  # BGE-M3 max sequence length
         
+        # Optional int8-quantized ONNX Runtime backend (CPU deployments)
+        self.backend = os.getenv('EMBEDDING_BACKEND', 'sentence-transformers').lower()
+        self.onnx_model_path = os.getenv('ONNX_MODEL_PATH', '/app/models/bge-m3-onnx-int8')
+        self.onnx_max_length = int(os.getenv('ONNX_MAX_LENGTH', '1024'))
+        
         logger.info(f"Initializing BGE-M3 embedding model on {self.device}")
         logger.info(f"Model path: {self.model_path}")
         self._load_model()
     
     def _load_model(self):
-        """Load SentenceTransformer model"""
+        """Load SentenceTransformer model (or ONNX Runtime model if configured)"""
+        if self.backend == 'onnx' and self._load_onnx_model():
+            return
+        
+        self.backend = 'sentence-transformers'
         try:
             self.model = SentenceTransformer(self.model_path, device=self.device)
             
@@ -54,6 +67,79 @@ class BGEEmbedding:
             logger.error(f"Failed to load BGE-M3 model: {e}")
             raise
     
+    def _load_onnx_model(self) -> bool:
+        """
+        Load int8-quantized BGE-M3 exported with download_model.py --onnx-int8
+        
+        Returns:
+            bool: True if ONNX model loaded, False to fall back to SentenceTransformer
+        """
+        if not os.path.exists(self.onnx_model_path):
+            logger.warning(f"ONNX model not found at {self.onnx_model_path}, falling back to SentenceTransformer")
+            return False
+        
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+            
+            self.tokenizer = AutoTokenizer.from_pretrained(self.onnx_model_path)
+            self.model = ORTModelForFeatureExtraction.from_pretrained(self.onnx_model_path)
+            self.device = 'cpu'
+            
+            logger.info(f"BGE-M3 int8 ONNX model loaded from {self.onnx_model_path}")
+            return True
+            
+        except ImportError:
+            logger.warning("optimum[onnxruntime] not available, falling back to SentenceTransformer")
+            return False
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX model: {e}, falling back to SentenceTransformer")
+            return False
+    
+    def _encode(self, texts, normalize: bool = True, batch_size: int = 16) -> np.ndarray:
+        """
+        Encode one text or a list of texts with the active backend
+        
+        Args:
+            texts: str or List[str], preprocessed input text(s)
+            normalize: bool, whether to L2-normalize the embeddings
+            batch_size: int, number of texts per forward pass
+            
+        Returns:
+            np.ndarray: embedding vector, or matrix of shape (len(texts), 1024)
+        """
+        if self.backend != 'onnx':
+            return self.model.encode(
+                texts,
+                batch_size=batch_size,
+                normalize_embeddings=normalize,
+                convert_to_numpy=True,
+                show_progress_bar=not isinstance(texts, str) and len(texts) > 10
+            )
+        
+        single = isinstance(texts, str)
+        batch_texts = [texts] if single else list(texts)
+        
+        outputs = []
+        for start in range(0, len(batch_texts), batch_size):
+            inputs = self.tokenizer(
+                batch_texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.onnx_max_length,
+                return_tensors='np'
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            # BGE-M3 dense embedding uses the [CLS] token, same as SentenceTransformer
+            outputs.append(np.asarray(hidden[:, 0], dtype=np.float32))
+        
+        embeddings = np.concatenate(outputs, axis=0)
+        if normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+        
+        return embeddings[0] if single else embeddings
+    
     def _preprocess_text(self, text: str) -> str:
         """
         Preprocess text for better embedding quality
@@ -159,12 +245,8 @@ class BGEEmbedding:
             # Preprocess text
             processed_text = self._preprocess_text(text)
             
-            # Generate embedding using SentenceTransformer
-            embedding = self.model.encode(
-                processed_text,
-                normalize_embeddings=normalize,
-                convert_to_numpy=True
-            )
+            # Generate embedding using the active backend
+            embedding = self._encode(processed_text, normalize=normalize)
             
             return embedding.astype(np.float32)
             
@@ -201,12 +283,7 @@ class BGEEmbedding:
                 return np.zeros(1024, dtype=np.float32)
             
             # Batch encoding
-            embeddings = self.model.encode(
-                valid_chunks,
-                normalize_embeddings=False,
-                convert_to_numpy=True,
-                show_progress_bar=len(valid_chunks) > 10
-            )
+            embeddings = self._encode(valid_chunks, normalize=False)
             
             # Average embeddings
             averaged_embedding = np.mean(embeddings, axis=0)
@@ -224,6 +301,36 @@ class BGEEmbedding:
             logger.error(f"Error in chunked embedding: {e}")
             return np.zeros(1024, dtype=np.float32)
     
+    def encode_batch(self, texts: List[str], normalize: bool = True, batch_size: int = 16) -> List[np.ndarray]:
+        """
+        Encode multiple texts in batched forward passes
+        
+        Args:
+            texts: List[str], input texts
+            normalize: bool, whether to normalize the embeddings
+            batch_size: int, number of texts per forward pass
+            
+        Returns:
+            List[np.ndarray]: embedding vectors in input order (zero vector for empty text)
+        """
+        embeddings = [np.zeros(1024, dtype=np.float32) for _ in texts]
+        
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not indices:
+            return embeddings
+        
+        try:
+            processed = [self._preprocess_text(texts[i]) for i in indices]
+            matrix = self._encode(processed, normalize=normalize, batch_size=batch_size)
+            
+            for i, vector in zip(indices, matrix):
+                embeddings[i] = vector.astype(np.float32)
+            
+        except Exception as e:
+            logger.error(f"Error in batch encoding: {e}")
+        
+        return embeddings
+    
     def cleanup(self):
         """Clean up model resources"""
         try:
@@ -242,6 +349,11 @@ class BGEEmbedding:
 # Global model instance (singleton pattern)
 _embedding_model = None
 
+# LRU cache of text embeddings keyed by a blake2b digest of the text
+TEXT_EMBEDDING_CACHE_SIZE = int(os.getenv('TEXT_EMBEDDING_CACHE_SIZE', 256))
+_text_embedding_cache = OrderedDict()
+_text_embedding_cache_lock = threading.Lock()
+
 def get_embedding_model() -> BGEEmbedding:
     """
     Get global BGE embedding model instance (singleton)
@@ -263,11 +375,26 @@ def cleanup_embedding_model():
     if _embedding_model is not None:
         _embedding_model.cleanup()
         _embedding_model = None
+    
+    clear_text_embedding_cache()
+
+def _text_embedding_cache_key(text: str, use_chunking: bool) -> bytes:
+    """Fixed-size cache key so long page texts are not held as dict keys"""
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    return digest + (b'c' if use_chunking else b'-')
+
+def clear_text_embedding_cache():
+    """Drop memoized text embeddings"""
+    with _text_embedding_cache_lock:
+        _text_embedding_cache.clear()
 
 def generate_text_embedding(text: str, use_chunking: bool = True) -> np.ndarray:
     """
     Generate embedding for text using BGE-M3 model
     
+    Results are memoized in a small LRU cache, so re-embedding the same
+    text (e.g. re-OCR followed by applying that result) skips inference.
+    
     Args:
         text: str, input text
         use_chunking: bool, whether to use chunking for long texts
@@ -279,6 +406,13 @@ def generate_text_embedding(text: str, use_chunking: bool = True) -> np.ndarray:
         logger.warning("Empty text provided for embedding generation")
         return np.zeros(1024, dtype=np.float32)
     
+    cache_key = _text_embedding_cache_key(text, use_chunking)
+    with _text_embedding_cache_lock:
+        cached = _text_embedding_cache.get(cache_key)
+        if cached is not None:
+            _text_embedding_cache.move_to_end(cache_key)
+            return cached.copy()
+    
     try:
         model = get_embedding_model()
         
@@ -289,6 +423,12 @@ def generate_text_embedding(text: str, use_chunking: bool = True) -> np.ndarray:
             embedding = model.encode_text(text)
         
         logger.info(f"Generated embedding with shape {embedding.shape}")
+        
+        with _text_embedding_cache_lock:
+            _text_embedding_cache[cache_key] = embedding.copy()
+            if len(_text_embedding_cache) > TEXT_EMBEDDING_CACHE_SIZE:
+                _text_embedding_cache.popitem(last=False)
+        
         return embedding
         
     except Exception as e:
@@ -311,18 +451,13 @@ def generate_page_embeddings(page_texts: List[str]) -> List[np.ndarray]:
     
     try:
         model = get_embedding_model()
-        embeddings = []
         
-        # Process each page text
         for i, page_text in enumerate(page_texts):
             if not page_text or not page_text.strip():
                 logger.warning(f"Empty text for page {i+1}, using zero vector")
-                embeddings.append(np.zeros(1024, dtype=np.float32))
-                continue
-            
-            # Use single encoding for page-level text (no chunking needed)
-            embedding = model.encode_text(page_text)
-            embeddings.append(embedding)
+        
+        # Page-level text needs no chunking; encode all pages in batches
+        embeddings = model.encode_batch(page_texts)
         
         logger.info(f"Generated embeddings for {len(embeddings)} pages")
         return embeddings
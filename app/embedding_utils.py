@@ -2,14 +2,52 @@
 Embedding comparison utilities for OCR quality assessment
 """
 
+import math
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+Vector = Union[np.ndarray, List[float]]
 
-def calculate_cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _pair_stats_numpy(a: np.ndarray, b: np.ndarray) -> Tuple[float, float, float, float, float, float]:
+    """dot(a,b), |a|^2, |b|^2, sum|b-a|, sum (b-a)^2, max|b-a|"""
+    diff = np.abs(b - a)
+    return (float(a @ b), float(a @ a), float(b @ b),
+            float(diff.sum()), float(diff @ diff), float(diff.max()) if diff.size else 0.0)
+
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _pair_stats_numba(a, b):
+        # One fused pass, no temporaries; accumulate in float64
+        ab = aa = bb = l1 = l2 = mx = 0.0
+        for i in range(a.shape[0]):
+            x = float(a[i])
+            y = float(b[i])
+            d = abs(y - x)
+            ab += x * y
+            aa += x * x
+            bb += y * y
+            l1 += d
+            l2 += d * d
+            if d > mx:
+                mx = d
+        return ab, aa, bb, l1, l2, mx
+    
+    _pair_stats = _pair_stats_numba
+else:
+    _pair_stats = _pair_stats_numpy
+
+
+def calculate_cosine_similarity(vec1: Vector, vec2: Vector) -> float:
     """
     Calculate cosine similarity between two vectors
     
@@ -21,9 +59,9 @@ def calculate_cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
         float: Cosine similarity score between -1 and 1
     """
     try:
-        # Convert to numpy arrays
-        v1 = np.array(vec1)
-        v2 = np.array(vec2)
+        # View as float32 arrays (no copy when already ndarrays)
+        v1 = np.asarray(vec1, dtype=np.float32)
+        v2 = np.asarray(vec2, dtype=np.float32)
         
         # Check dimensions match
         if v1.shape != v2.shape:
@@ -31,14 +69,12 @@ def calculate_cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
             return 0.0
         
         # Calculate cosine similarity
-        dot_product = np.dot(v1, v2)
-        norm_v1 = np.linalg.norm(v1)
-        norm_v2 = np.linalg.norm(v2)
+        dot_product, sq_norm_v1, sq_norm_v2 = _pair_stats(v1, v2)[:3]
         
-        if norm_v1 == 0 or norm_v2 == 0:
+        if sq_norm_v1 == 0 or sq_norm_v2 == 0:
             return 0.0
         
-        cosine_sim = dot_product / (norm_v1 * norm_v2)
+        cosine_sim = dot_product / math.sqrt(sq_norm_v1 * sq_norm_v2)
         return float(cosine_sim)
         
     except Exception as e:
@@ -46,7 +82,7 @@ def calculate_cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
         return 0.0
 
 
-def calculate_euclidean_distance(vec1: List[float], vec2: List[float]) -> float:
+def calculate_euclidean_distance(vec1: Vector, vec2: Vector) -> float:
     """
     Calculate Euclidean distance between two vectors
     
@@ -58,8 +94,8 @@ def calculate_euclidean_distance(vec1: List[float], vec2: List[float]) -> float:
         float: Euclidean distance (lower is more similar)
     """
     try:
-        v1 = np.array(vec1)
-        v2 = np.array(vec2)
+        v1 = np.asarray(vec1, dtype=np.float32)
+        v2 = np.asarray(vec2, dtype=np.float32)
         
         if v1.shape != v2.shape:
             logger.error(f"Vector dimensions don't match: {v1.shape} vs {v2.shape}")
@@ -73,7 +109,7 @@ def calculate_euclidean_distance(vec1: List[float], vec2: List[float]) -> float:
         return float('inf')
 
 
-def calculate_manhattan_distance(vec1: List[float], vec2: List[float]) -> float:
+def calculate_manhattan_distance(vec1: Vector, vec2: Vector) -> float:
     """
     Calculate Manhattan (L1) distance between two vectors
     
@@ -85,8 +121,8 @@ def calculate_manhattan_distance(vec1: List[float], vec2: List[float]) -> float:
         float: Manhattan distance (lower is more similar)
     """
     try:
-        v1 = np.array(vec1)
-        v2 = np.array(vec2)
+        v1 = np.asarray(vec1, dtype=np.float32)
+        v2 = np.asarray(vec2, dtype=np.float32)
         
         if v1.shape != v2.shape:
             logger.error(f"Vector dimensions don't match: {v1.shape} vs {v2.shape}")
@@ -100,7 +136,7 @@ def calculate_manhattan_distance(vec1: List[float], vec2: List[float]) -> float:
         return float('inf')
 
 
-def compare_embeddings(old_embedding: List[float], new_embedding: List[float]) -> Dict[str, float]:
+def compare_embeddings(old_embedding: Vector, new_embedding: Vector) -> Dict[str, float]:
     """
     Compare two embeddings using multiple metrics
     
@@ -112,29 +148,38 @@ def compare_embeddings(old_embedding: List[float], new_embedding: List[float]) -
         dict: Comparison metrics
     """
     try:
-        # Calculate various similarity/distance metrics
-        cosine_sim = calculate_cosine_similarity(old_embedding, new_embedding)
-        euclidean_dist = calculate_euclidean_distance(old_embedding, new_embedding)
-        manhattan_dist = calculate_manhattan_distance(old_embedding, new_embedding)
+        old_arr = np.asarray(old_embedding, dtype=np.float32)
+        new_arr = np.asarray(new_embedding, dtype=np.float32)
+        if old_arr.shape != new_arr.shape:
+            raise ValueError(f"Vector dimensions don't match: {old_arr.shape} vs {new_arr.shape}")
+        
+        # All metrics below derive from one pass over both vectors
+        dot_product, sq_old, sq_new, manhattan_dist, sq_diff, max_diff = _pair_stats(old_arr, new_arr)
+        old_magnitude = math.sqrt(sq_old)
+        new_magnitude = math.sqrt(sq_new)
+        
+        if old_magnitude > 0 and new_magnitude > 0:
+            cosine_sim = dot_product / (old_magnitude * new_magnitude)
+        else:
+            cosine_sim = 0.0
+        euclidean_dist = math.sqrt(sq_diff)
+        
+        # Mean and standard deviation of |new - old| from its first two moments
+        n = old_arr.size
+        mean_diff = manhattan_dist / n if n else 0.0
+        std_diff = math.sqrt(max(sq_diff / n - mean_diff * mean_diff, 0.0)) if n else 0.0
         
         # Calculate percentage change in magnitude
-        old_magnitude = np.linalg.norm(np.array(old_embedding))
-        new_magnitude = np.linalg.norm(np.array(new_embedding))
         magnitude_change = ((new_magnitude - old_magnitude) / old_magnitude * 100) if old_magnitude > 0 else 0
         
-        # Calculate element-wise statistics
-        old_arr = np.array(old_embedding)
-        new_arr = np.array(new_embedding)
-        element_wise_diff = np.abs(new_arr - old_arr)
-        
         return {
             'cosine_similarity': cosine_sim,
             'euclidean_distance': euclidean_dist,
             'manhattan_distance': manhattan_dist,
             'magnitude_change_percent': magnitude_change,
-            'max_element_diff': float(np.max(element_wise_diff)),
-            'mean_element_diff': float(np.mean(element_wise_diff)),
-            'std_element_diff': float(np.std(element_wise_diff)),
+            'max_element_diff': max_diff,
+            'mean_element_diff': mean_diff,
+            'std_element_diff': std_diff,
             'similarity_score': float(cosine_sim) * 100,  # Percentage similarity
             'is_significant_change': bool(float(cosine_sim) < 0.95)  # Threshold for significant change
         }
@@ -220,9 +265,42 @@ def analyze_text_quality_change(old_text: str, new_text: str) -> Dict[str, any]:
         }
 
 
+def create_identical_text_report(text: str) -> Dict[str, any]:
+    """
+    Comparison report for an OCR result that reproduced the existing text
+    
+    Identical input gives identical embeddings, so no vectors are needed.
+    
+    Args:
+        text: The (unchanged) page text
+    
+    Returns:
+        dict: Report in the same shape as create_embedding_comparison_report
+    """
+    return {
+        'has_old_embedding': True,
+        'has_new_embedding': True,
+        'identical': True,
+        'text_analysis': analyze_text_quality_change(text, text),
+        'embedding_comparison': {
+            'cosine_similarity': 1.0,
+            'euclidean_distance': 0.0,
+            'manhattan_distance': 0.0,
+            'magnitude_change_percent': 0.0,
+            'max_element_diff': 0.0,
+            'mean_element_diff': 0.0,
+            'std_element_diff': 0.0,
+            'similarity_score': 100.0,
+            'is_significant_change': False
+        },
+        'overall_assessment': 'minimal_change',
+        'recommendation': 'OCR reproduced the existing text exactly'
+    }
+
+
 def create_embedding_comparison_report(
-    old_embedding: Optional[List[float]], 
-    new_embedding: Optional[List[float]],
+    old_embedding: Optional[Vector], 
+    new_embedding: Optional[Vector],
     old_text: str,
     new_text: str
 ) -> Dict[str, any]:
@@ -244,7 +322,7 @@ def create_embedding_comparison_report(
         'text_analysis': analyze_text_quality_change(old_text, new_text)
     }
     
-    if old_embedding and new_embedding:
+    if old_embedding is not None and new_embedding is not None:
         report['embedding_comparison'] = compare_embeddings(old_embedding, new_embedding)
         
         # Overall assessment
@@ -4,9 +4,11 @@ Implements comprehensive file validation, size limits, and malicious file detect
 """
 
 import os
+import json
 import magic
 import hashlib
 import logging
+import threading
 import tempfile
 import subprocess
 from typing import Dict, List, Tuple, Optional, Any
@@ -49,6 +51,9 @@ class FileSecurityConfig:
     """Configuration for file security validation"""
     
     def __init__(self):
+        # Guards admin updates so a multi-field change is applied as a unit
+        self._lock = threading.RLock()
+        
         # File size limits (in bytes)
         self.max_file_size = int(os.getenv('MAX_FILE_SIZE', 100 * 1024 * 1024))  # 100MB
         self.max_filename_length = int(os.getenv('MAX_FILENAME_LENGTH', 255))
@@ -113,6 +118,68 @@ class FileSecurityConfig:
         # Quarantine settings
         self.enable_quarantine = os.getenv('ENABLE_QUARANTINE', 'false').lower() == 'true'
         self.quarantine_dir = Path(os.getenv('QUARANTINE_DIR', '/tmp/refserver_quarantine'))
+    
+    def apply_settings(self, settings: Dict[str, Any]):
+        """Apply persisted admin settings on top of environment defaults"""
+        with self._lock:
+            for key in SecuritySettingsStore.SETTING_KEYS:
+                if key in settings:
+                    setattr(self, key, settings[key])
+
+
+class SecuritySettingsStore:
+    """
+    Persistent store for security settings changed through the admin interface.
+    
+    Settings are kept in a JSON file so they survive restarts and are shared by
+    all worker processes; workers reload the file when its mtime changes.
+    """
+    
+    SETTING_KEYS = ('enable_quarantine', 'max_file_size', 'max_uploads_per_hour', 'max_uploads_per_day')
+    
+    def __init__(self, settings_file: str = None):
+        self.settings_file = Path(settings_file or os.getenv('SECURITY_SETTINGS_FILE', '/refdata/security_settings.json'))
+        self._lock = threading.Lock()
+    
+    def get_mtime(self) -> float:
+        """Get modification time of the settings file (0 if missing)"""
+        try:
+            return self.settings_file.stat().st_mtime
+        except OSError:
+            return 0.0
+    
+    def load(self) -> Dict[str, Any]:
+        """Load all persisted settings"""
+        try:
+            with open(self.settings_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Failed to load security settings: {e}")
+            return {}
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a single persisted setting"""
+        return self.load().get(key, default)
+    
+    def set(self, **settings) -> Dict[str, Any]:
+        """Persist one or more settings atomically"""
+        unknown = set(settings) - set(self.SETTING_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown security settings: {', '.join(sorted(unknown))}")
+        
+        with self._lock:
+            current = self.load()
+            current.update(settings)
+            
+            self.settings_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.settings_file.with_suffix('.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(current, f, indent=2)
+            os.replace(temp_file, self.settings_file)
+        
+        return current
 
 
 class FileValidator:
@@ -260,12 +327,17 @@ class FileValidator:
         tracker['hourly'] = [t for t in tracker['hourly'] if t > hour_ago]
         tracker['daily'] = [t for t in tracker['daily'] if t > day_ago]
         
+        # Read both limits together so a concurrent admin update is seen whole
+        with self.config._lock:
+            max_per_hour = self.config.max_uploads_per_hour
+            max_per_day = self.config.max_uploads_per_day
+        
         # Check limits
-        if len(tracker['hourly']) >= self.config.max_uploads_per_hour:
-            raise FileSecurityError(f"Rate limit exceeded: max {self.config.max_uploads_per_hour} uploads per hour")
+        if len(tracker['hourly']) >= max_per_hour:
+            raise FileSecurityError(f"Rate limit exceeded: max {max_per_hour} uploads per hour")
         
-        if len(tracker['daily']) >= self.config.max_uploads_per_day:
-            raise FileSecurityError(f"Rate limit exceeded: max {self.config.max_uploads_per_day} uploads per day")
+        if len(tracker['daily']) >= max_per_day:
+            raise FileSecurityError(f"Rate limit exceeded: max {max_per_day} uploads per day")
         
         # Record this upload
         tracker['hourly'].append(now)
@@ -639,15 +711,36 @@ class FileValidator:
 
 # Global validator instance
 _file_validator = None
+_settings_store = None
+_settings_mtime = None
+
+
+def get_settings_store() -> SecuritySettingsStore:
+    """Get global security settings store instance (singleton)"""
+    global _settings_store
+    
+    if _settings_store is None:
+        _settings_store = SecuritySettingsStore()
+    
+    return _settings_store
 
 
 def get_file_validator() -> FileValidator:
-    """Get global file validator instance (singleton)"""
-    global _file_validator
+    """Get global file validator instance (singleton), refreshed from persisted settings"""
+    global _file_validator, _settings_mtime
     
     if _file_validator is None:
         _file_validator = FileValidator()
     
+    # Pick up settings written by this or another worker
+    store = get_settings_store()
+    mtime = store.get_mtime()
+    if mtime != _settings_mtime:
+        _file_validator.config.apply_settings(store.load())
+        if _file_validator.config.enable_quarantine:
+            _file_validator.config.quarantine_dir.mkdir(parents=True, exist_ok=True)
+        _settings_mtime = mtime
+    
     return _file_validator
 
 
@@ -111,6 +111,7 @@ class GPUMonitor:
             return {
                 "running": False,
                 "error": str(e)
+            }
     
     def get_gpu_processes(self) -> List[Dict]:
         """Get processes using GPU"""
@@ -8,7 +8,7 @@ from typing import Dict, List, Optional
 from pathlib import Path
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, BackgroundTasks, Request
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
@@ -45,7 +45,8 @@ app = FastAPI(
     description="Unified PDF processing system for academic papers with OCR, embedding, layout analysis, and metadata extraction",
     version=get_version(),
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Global cleanup task control
@@ -11,7 +11,11 @@ logger = logging.getLogger("RefServerModels")
 
 # Database setup
 DATABASE_PATH = os.path.join('/refdata', 'refserver.db')
-db = SqliteDatabase(DATABASE_PATH, pragmas={'foreign_keys': 1})
+db = SqliteDatabase(DATABASE_PATH, pragmas={
+    'foreign_keys': 1,
+    'cache_size': -64000,  # 64 MB page cache per connection
+    'temp_store': 'memory'
+})
 
 class BaseModel(Model):
     class Meta:
@@ -41,8 +45,17 @@ class Paper(BaseModel):
     class Meta:
         indexes = (
             (('content_id',), False),
+            (('created_at',), False),  # Newest-first paper list pagination
         )
 
+# Case-insensitive index so filename prefix searches (LIKE 'term%') can use it
+Paper.add_index(SQL('CREATE INDEX IF NOT EXISTS paper_filename_nocase ON paper (filename COLLATE NOCASE)'))
+
+# Papers with any pending GPU task. Queries must use this exact literal
+# condition (not bound parameters) for SQLite to pick the partial index.
+PAPER_PENDING_CONDITION = 'ocr_quality_completed = 0 OR layout_completed = 0 OR metadata_llm_completed = 0'
+Paper.add_index(SQL(f'CREATE INDEX IF NOT EXISTS idx_paper_pending ON paper (created_at DESC) WHERE {PAPER_PENDING_CONDITION}'))
+
 
 class ProcessingJob(BaseModel):
     """Model for tracking PDF processing job status"""
@@ -128,6 +141,7 @@ class PageEmbedding(BaseModel):
     page_text = TextField(null=True)  # Extracted text from this page
     vector_blob = BlobField()  # Serialized numpy array
     vector_dim = IntegerField()  # Vector dimension
+    vector_scale = FloatField(null=True)  # int8 dequantization scale (NULL = float32 blob)
     model_name = CharField(default='bge-m3')  # Embedding model used
     created_at = DateTimeField(default=datetime.datetime.now)
     
@@ -142,6 +156,7 @@ class Embedding(BaseModel):
     vector_blob = BlobField()  # Serialized numpy array
     vector_dim = IntegerField()  # Vector dimension
     model_name = CharField(default='bge-m3')  # Embedding model used
+    text_hash = CharField(max_length=64, null=True, index=True)  # SHA-256 of the embedded text
     created_at = DateTimeField(default=datetime.datetime.now)
 
 class Metadata(BaseModel):
@@ -351,15 +366,47 @@ def serialize_vector(vector):
     
     return vector.tobytes()
 
-def deserialize_vector(vector_blob, vector_dim):
+def quantize_int8(vector):
+    """
+    Quantize a vector to int8 with a single symmetric scale
+    
+    Args:
+        vector: numpy array or list
+    
+    Returns:
+        tuple: (int8 numpy array, float scale)
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.abs(vector).max()) if vector.size else 0.0
+    scale = max_abs / 127 if max_abs > 0 else 1.0
+    quantized = np.round(vector / scale).astype(np.int8)
+    return quantized, scale
+
+def serialize_vector_int8(vector):
+    """
+    Serialize a vector as int8 bytes for storage
+    
+    Args:
+        vector: numpy array or list
+    
+    Returns:
+        tuple: (bytes, float scale) for vector_blob / vector_scale
+    """
+    quantized, scale = quantize_int8(vector)
+    return quantized.tobytes(), scale
+
+def deserialize_vector(vector_blob, vector_dim, vector_scale=None):
     """
     Deserialize bytes back to numpy array
     
     Args:
         vector_blob: bytes data
         vector_dim: int, vector dimension
+        vector_scale: float, int8 scale; None for float32 blobs
     
     Returns:
         numpy.ndarray: Deserialized vector
     """
+    if vector_scale is not None:
+        return np.frombuffer(vector_blob, dtype=np.int8).reshape(vector_dim).astype(np.float32) * np.float32(vector_scale)
     return np.frombuffer(vector_blob, dtype=np.float32).reshape(vector_dim)
\ No newline at end of file
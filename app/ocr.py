@@ -2,6 +2,7 @@ import os
 import logging
 import tempfile
 import shutil
+import threading
 import fitz  # PyMuPDF
 from pdf2image import convert_from_path
 import ocrmypdf
@@ -9,9 +10,19 @@ from pathlib import Path
 import langdetect
 from langdetect.lang_detect_exception import LangDetectException
 from datetime import datetime
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Page OCR is parallelised across pages, so each Tesseract child process
+# uses this many OpenMP threads. Only the child's environment is set; the
+# server's own OpenMP users (torch) keep their normal thread count.
+TESSERACT_THREAD_LIMIT = os.getenv('TESSERACT_THREAD_LIMIT', '1')
+
+# PyMuPDF is not safe to use from several threads at once; every fitz call
+# in this module runs under this lock
+_FITZ_LOCK = threading.Lock()
+
 # Language mapping for Tesseract
 TESSERACT_LANG_MAP = {
     'en': 'eng',
@@ -41,22 +52,21 @@ def extract_text_from_pdf(pdf_path):
         tuple: (text_content, page_count)
     """
     try:
-        doc = fitz.open(pdf_path)
         text_content = ""
-        page_count = len(doc)
-        
-        for page_num in range(page_count):
-            page = doc[page_num]
-            # Use blocks to preserve better line structure
-            blocks = page.get_text("blocks")
-            page_text = ""
-            for block in blocks:
-                # Block format: (x0, y0, x1, y1, "text", block_no, block_type)
-                if len(block) > 4 and isinstance(block[4], str):
-                    page_text += block[4] + "\n"
-            text_content += page_text + "\n"
         
-        doc.close()
+        with _FITZ_LOCK, fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+            
+            for page_num in range(page_count):
+                page = doc[page_num]
+                # Use blocks to preserve better line structure
+                blocks = page.get_text("blocks")
+                page_text = ""
+                for block in blocks:
+                    # Block format: (x0, y0, x1, y1, "text", block_no, block_type)
+                    if len(block) > 4 and isinstance(block[4], str):
+                        page_text += block[4] + "\n"
+                text_content += page_text + "\n"
         
         logger.info(f"Extracted text from {page_count} pages")
         return text_content.strip(), page_count
@@ -76,22 +86,21 @@ def extract_page_texts_from_pdf(pdf_path):
         tuple: (page_texts, page_count) where page_texts is list of strings
     """
     try:
-        doc = fitz.open(pdf_path)
         page_texts = []
-        page_count = len(doc)
-        
-        for page_num in range(page_count):
-            page = doc[page_num]
-            # Use blocks to preserve better line structure
-            blocks = page.get_text("blocks")
-            page_text = ""
-            for block in blocks:
-                # Block format: (x0, y0, x1, y1, "text", block_no, block_type)
-                if len(block) > 4 and isinstance(block[4], str):
-                    page_text += block[4] + "\n"
-            page_texts.append(page_text.strip())
         
-        doc.close()
+        with _FITZ_LOCK, fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+            
+            for page_num in range(page_count):
+                page = doc[page_num]
+                # Use blocks to preserve better line structure
+                blocks = page.get_text("blocks")
+                page_text = ""
+                for block in blocks:
+                    # Block format: (x0, y0, x1, y1, "text", block_no, block_type)
+                    if len(block) > 4 and isinstance(block[4], str):
+                        page_text += block[4] + "\n"
+                page_texts.append(page_text.strip())
         
         logger.info(f"Extracted page texts from {page_count} pages")
         return page_texts, page_count
@@ -101,6 +110,51 @@ def extract_page_texts_from_pdf(pdf_path):
         return [], 0
 
 
+def _format_page_text(page):
+    """
+    Render a PyMuPDF page's text with font size markers
+    
+    Args:
+        page: fitz.Page
+    
+    Returns:
+        str: formatted text with font size markers
+    """
+    # Extract text with detailed formatting
+    text_dict = page.get_text("dict")
+    
+    formatted_text = ""
+    previous_font_size = None
+    
+    # Process blocks
+    for block in text_dict.get("blocks", []):
+        if block.get("type") == 0:  # Text block
+            for line in block.get("lines", []):
+                line_text = ""
+                line_font_sizes = []
+                
+                for span in line.get("spans", []):
+                    text = span.get("text", "")
+                    font_size = round(span.get("size", 0))
+                    
+                    if text.strip():
+                        line_text += text
+                        line_font_sizes.append(font_size)
+                
+                if line_text.strip():
+                    # Calculate average font size for the line
+                    avg_font_size = sum(line_font_sizes) / len(line_font_sizes) if line_font_sizes else 0
+                    avg_font_size = round(avg_font_size)
+                    
+                    # Add font size marker if it changed significantly
+                    if previous_font_size is None or abs(avg_font_size - previous_font_size) > 2:
+                        formatted_text += f"\n[FONT_SIZE:{avg_font_size}]\n"
+                        previous_font_size = avg_font_size
+                    
+                    formatted_text += line_text.strip() + "\n"
+    
+    return formatted_text.strip()
+
 def extract_page_text_with_formatting(pdf_path, page_number=1):
     """
     Extract text from a specific page with font size information
@@ -113,55 +167,15 @@ def extract_page_text_with_formatting(pdf_path, page_number=1):
         str: formatted text with font size markers
     """
     try:
-        doc = fitz.open(pdf_path)
-        if page_number < 1 or page_number > len(doc):
-            logger.error(f"Invalid page number {page_number}")
-            return ""
+        with _FITZ_LOCK, fitz.open(pdf_path) as doc:
+            if page_number < 1 or page_number > len(doc):
+                logger.error(f"Invalid page number {page_number}")
+                return ""
             
-        page = doc[page_number - 1]  # Convert to 0-indexed
-        
-        # Extract text with detailed formatting
-        text_dict = page.get_text("dict")
-        
-        formatted_text = ""
-        previous_font_size = None
-        
-        # Process blocks
-        for block in text_dict.get("blocks", []):
-            if block.get("type") == 0:  # Text block
-                for line in block.get("lines", []):
-                    line_text = ""
-                    line_font_sizes = []
-                    
-                    for span in line.get("spans", []):
-                        text = span.get("text", "")
-                        font_size = round(span.get("size", 0))
-                        font_name = span.get("font", "")
-                        flags = span.get("flags", 0)
-                        
-                        # Check if bold (flag bit 16)
-                        is_bold = bool(flags & 2**16)
-                        
-                        if text.strip():
-                            line_text += text
-                            line_font_sizes.append(font_size)
-                    
-                    if line_text.strip():
-                        # Calculate average font size for the line
-                        avg_font_size = sum(line_font_sizes) / len(line_font_sizes) if line_font_sizes else 0
-                        avg_font_size = round(avg_font_size)
-                        
-                        # Add font size marker if it changed significantly
-                        if previous_font_size is None or abs(avg_font_size - previous_font_size) > 2:
-                            formatted_text += f"\n[FONT_SIZE:{avg_font_size}]\n"
-                            previous_font_size = avg_font_size
-                        
-                        formatted_text += line_text.strip() + "\n"
-        
-        doc.close()
+            formatted_text = _format_page_text(doc[page_number - 1])  # Convert to 0-indexed
         
         logger.info(f"Extracted formatted text from page {page_number}")
-        return formatted_text.strip()
+        return formatted_text
         
     except Exception as e:
         logger.error(f"Error extracting formatted text from PDF: {e}")
@@ -180,16 +194,18 @@ def extract_first_pages_with_formatting(pdf_path, num_pages=2):
         str: combined formatted text from first pages
     """
     try:
-        combined_text = ""
+        parts = []
         
-        for page_num in range(1, num_pages + 1):
-            page_text = extract_page_text_with_formatting(pdf_path, page_num)
-            if page_text:
-                combined_text += f"\n[PAGE {page_num}]\n{page_text}\n"
-            else:
-                break  # Stop if we can't extract a page
+        # Open the PDF once for all requested pages
+        with _FITZ_LOCK, fitz.open(pdf_path) as doc:
+            for page_num in range(1, min(num_pages, len(doc)) + 1):
+                page_text = _format_page_text(doc[page_num - 1])
+                if page_text:
+                    parts.append(f"\n[PAGE {page_num}]\n{page_text}\n")
+                else:
+                    break  # Stop if we can't extract a page
         
-        return combined_text.strip()
+        return "".join(parts).strip()
         
     except Exception as e:
         logger.error(f"Error extracting formatted pages: {e}")
@@ -676,7 +692,7 @@ def perform_ocr(input_pdf_path, output_pdf_path, language='eng', force_ocr=False
             logger.error(f"Failed to copy original PDF: {copy_error}")
         return False
 
-def regenerate_pdf_text_layer(input_pdf_path, output_pdf_path, language='eng', backup_original=True):
+def regenerate_pdf_text_layer(input_pdf_path, output_pdf_path, language='eng', backup_original=True, jobs=None):
     """
     Regenerate PDF text layer using ocrmypdf with force OCR
     
@@ -685,6 +701,7 @@ def regenerate_pdf_text_layer(input_pdf_path, output_pdf_path, language='eng', b
         output_pdf_path: str, path to output PDF with new text layer
         language: str, Tesseract language parameter
         backup_original: bool, whether to backup original PDF
+        jobs: int, ocrmypdf worker count (defaults to OCRMYPDF_JOBS or the CPU count)
     
     Returns:
         dict: Processing results with success status and details
@@ -716,6 +733,7 @@ def regenerate_pdf_text_layer(input_pdf_path, output_pdf_path, language='eng', b
             'remove_background': False,  # Preserve original appearance
             'rotate_pages': True,
             'skip_text': False,  # Include text layer
+            'jobs': jobs or int(os.getenv('OCRMYPDF_JOBS', os.cpu_count() or 1)),
             # 'tesseract_config': PSM config removed due to ocrmypdf compatibility issues
         }
         
@@ -752,6 +770,32 @@ def regenerate_pdf_text_layer(input_pdf_path, output_pdf_path, language='eng', b
             'backup_path': backup_path
         }
 
+def _tesseract_image_to_data(image, language, config):
+    """
+    Run Tesseract on a PIL image with a per-process OpenMP thread limit
+    
+    pytesseract starts Tesseract with the server's environment, so the
+    child is run directly here and its TSV output is parsed with
+    pytesseract's own parser.
+    
+    Returns:
+        dict: same layout as pytesseract.image_to_data(output_type=Output.DICT)
+    """
+    import shlex
+    import subprocess
+    from pytesseract import pytesseract as tesseract_api
+    
+    env = {**os.environ, 'OMP_THREAD_LIMIT': TESSERACT_THREAD_LIMIT}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_path = os.path.join(temp_dir, 'page.png')
+        image.save(image_path, 'PNG')
+        result = subprocess.run(
+            [tesseract_api.tesseract_cmd, image_path, 'stdout', '-l', language,
+             *shlex.split(config), 'tsv'],
+            capture_output=True, env=env, check=True
+        )
+    return tesseract_api.file_to_dict(result.stdout.decode('utf-8'), '\t', -1)
+
 def perform_page_ocr_with_tesseract(pdf_path, page_number, language='eng', psm_mode=4):
     """
     Perform OCR on a specific page using Tesseract with paragraph detection
@@ -766,34 +810,19 @@ def perform_page_ocr_with_tesseract(pdf_path, page_number, language='eng', psm_m
         tuple: (extracted_text, confidence_score)
     """
     try:
-        import pytesseract
-        from PIL import Image
+        # Render in-process from the cached PyMuPDF document rather than
+        # launching poppler and re-parsing the PDF for every page
+        image = render_pdf_page(pdf_path, page_number, dpi=300)  # High DPI for better OCR
         
-        # Convert specific page to image
-        images = convert_from_path(
-            pdf_path,
-            first_page=page_number,
-            last_page=page_number,
-            dpi=300,  # High DPI for better OCR
-            fmt='PNG'
-        )
-        
-        if not images:
+        if image is None:
             logger.error(f"No images generated for page {page_number}")
             return "", 0
         
-        image = images[0]
-        
         # Configure Tesseract with PSM for better paragraph detection
         custom_config = f'--psm {psm_mode} --oem 3'
         
         # Get text with detailed data including coordinates
-        data = pytesseract.image_to_data(
-            image,
-            lang=language,
-            config=custom_config,
-            output_type=pytesseract.Output.DICT
-        )
+        data = _tesseract_image_to_data(image, language, custom_config)
         
         # Process text with paragraph detection
         extracted_text, avg_confidence = process_ocr_data_with_paragraphs(data)
@@ -1205,6 +1234,33 @@ def build_paragraphs(lines, paragraph_breaks):
     
     return paragraphs
 
+@lru_cache(maxsize=32)
+def _open_pdf_document(pdf_path, mtime_ns):
+    """Open a PDF once per (path, mtime); a changed file gets a new cache entry"""
+    return fitz.open(pdf_path)
+
+def render_pdf_page(pdf_path, page_number, dpi=150):
+    """
+    Render a single PDF page in-process with PyMuPDF
+    
+    Args:
+        pdf_path: str, path to PDF file
+        page_number: int, page number (1-based)
+        dpi: int, image resolution
+    
+    Returns:
+        PIL.Image or None if the page does not exist
+    """
+    from PIL import Image
+    
+    with _FITZ_LOCK:
+        doc = _open_pdf_document(pdf_path, os.stat(pdf_path).st_mtime_ns)
+        if page_number < 1 or page_number > doc.page_count:
+            return None
+        
+        pix = doc[page_number - 1].get_pixmap(dpi=dpi)
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
 def extract_first_page_image(pdf_path, output_path, dpi=150):
     """
     Extract first page as image for quality assessment
@@ -1218,17 +1274,16 @@ def extract_first_page_image(pdf_path, output_path, dpi=150):
         str: path to saved image or None if failed
     """
     try:
-        # Convert first page to image
-        images = convert_from_path(
-            pdf_path,
-            first_page=1,
-            last_page=1,
-            dpi=dpi,
-            fmt='PNG'
-        )
-        
-        if images:
-            images[0].save(output_path, 'PNG')
+        # Render first page in-process rather than via a pdftoppm subprocess.
+        # This is a one-off render, so the document is opened and closed here
+        # instead of being held in render_pdf_page's document cache
+        pix = None
+        with _FITZ_LOCK, fitz.open(pdf_path) as doc:
+            if doc.page_count > 0:
+                pix = doc[0].get_pixmap(dpi=dpi)
+        
+        if pix is not None:
+            pix.save(output_path)
             logger.info(f"First page image saved: {output_path}")
             return output_path
         else:
@@ -13,6 +13,9 @@ from duplicate_detector import get_duplicate_detector
 
 logger = logging.getLogger(__name__)
 
+# Interval for refreshing the cached admin dashboard statistics
+ADMIN_STATS_REFRESH_SECONDS = 30
+
 class BackgroundScheduler:
     """
     Background scheduler for automatic maintenance tasks
@@ -70,10 +73,14 @@ class BackgroundScheduler:
         # Monthly deep cleanup - check if it's the 1st day of the month at 4 AM
         schedule.every().day.at("04:00").do(self._check_monthly_cleanup)
         
+        # Keep admin dashboard statistics warm so requests never count rows
+        schedule.every(ADMIN_STATS_REFRESH_SECONDS).seconds.do(self._refresh_admin_stats)
+        
         logger.info("📅 Scheduled background tasks:")
         logger.info("  - Daily cleanup: Every day at 2:00 AM")
         logger.info("  - Weekly comprehensive cleanup: Sundays at 3:00 AM")
         logger.info("  - Monthly deep cleanup: 1st day of month at 4:00 AM")
+        logger.info(f"  - Admin stats refresh: Every {ADMIN_STATS_REFRESH_SECONDS} seconds")
     
     def _run_scheduler(self):
         """Run the scheduler loop"""
@@ -88,6 +95,14 @@ class BackgroundScheduler:
                 logger.error(f"Scheduler loop error: {e}")
                 time.sleep(60)  # Wait 1 minute before retrying
     
+    def _refresh_admin_stats(self):
+        """Recompute the admin dashboard statistics snapshot"""
+        try:
+            from admin import refresh_admin_stats
+            refresh_admin_stats()
+        except Exception as e:
+            logger.error(f"Admin stats refresh failed: {e}")
+    
     def _daily_cleanup(self):
         """Daily cleanup task - light maintenance"""
         try:
@@ -14,6 +14,9 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of page embeddings sent to ChromaDB in one add() call
+PAGE_ADD_BATCH_SIZE = 200
+
 class ChromaVectorDB:
     """
     ChromaDB client for managing paper and page embeddings
@@ -155,8 +158,8 @@ class ChromaVectorDB:
             # Remove existing page embeddings for this document
             logger.info(f"🗑️ Removing existing page embeddings for {doc_id}")
             try:
-                existing_ids = [f"{doc_id}_page_{i+1}" for i in range(100)]  # Assume max 100 pages
-                self.pages_collection.delete(ids=existing_ids)
+                # Filter on metadata so documents of any length are fully cleared
+                self.pages_collection.delete(where={'doc_id': doc_id})
                 logger.debug(f"🗑️ Attempted to delete existing page IDs for {doc_id}")
             except Exception as delete_error:
                 logger.debug(f"🗑️ Delete operation error (expected if no existing data): {delete_error}")
@@ -198,13 +201,15 @@ class ChromaVectorDB:
                 logger.error(f"❌ Data length mismatch: IDs={len(ids)}, embeddings={len(embeddings)}, metadatas={len(metadatas)}")
                 return False
             
-            # Batch insert
+            # Batch insert in bounded chunks so long documents don't build one huge HNSW write
             logger.info(f"💾 Executing ChromaDB batch insert for {doc_id}")
-            self.pages_collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                metadatas=metadatas
-            )
+            for start in range(0, len(ids), PAGE_ADD_BATCH_SIZE):
+                end = start + PAGE_ADD_BATCH_SIZE
+                self.pages_collection.add(
+                    ids=ids[start:end],
+                    embeddings=embeddings[start:end],
+                    metadatas=metadatas[start:end]
+                )
             
             logger.info(f"✅ Added {len(page_embeddings)} page embeddings for document {doc_id}")
             
@@ -333,14 +338,8 @@ class ChromaVectorDB:
             
             # Delete page embeddings
             try:
-                # Get all page IDs for this document
-                page_results = self.pages_collection.get(
-                    where={'doc_id': doc_id},
-                    include=['metadatas']
-                )
-                
-                if page_results['ids']:
-                    self.pages_collection.delete(ids=page_results['ids'])
+                # Delete by metadata filter without fetching the IDs first
+                self.pages_collection.delete(where={'doc_id': doc_id})
             except:
                 pass
             
@@ -351,6 +350,25 @@ class ChromaVectorDB:
             logger.error(f"Failed to delete embeddings for {doc_id}: {e}")
             return False
     
+    def reset_collections(self) -> Dict[str, int]:
+        """
+        Drop and recreate both collections, discarding all embeddings
+        
+        Returns:
+            Dict: Number of documents removed per collection
+        """
+        removed = {
+            'papers': self.papers_collection.count(),
+            'pages': self.pages_collection.count()
+        }
+        
+        # Dropping the collection avoids fetching every ID just to delete it
+        self.client.delete_collection("papers")
+        self.client.delete_collection("pages")
+        self._init_collections()
+        
+        return removed
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about ChromaDB collections
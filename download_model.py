@@ -85,7 +85,46 @@ def verify_model():
         print(f"❌ Model verification failed: {e}")
         return False
 
+def export_onnx_int8_model():
+    """BGE-M3 모델을 ONNX로 변환하고 int8 동적 양자화 적용 (EMBEDDING_BACKEND=onnx 용)"""
+    local_model_path = "./models/bge-m3-local"
+    onnx_export_path = "./models/bge-m3-onnx"
+    onnx_int8_path = "./models/bge-m3-onnx-int8"
+    
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+    except ImportError:
+        print("❌ optimum[onnxruntime] is required: pip install optimum[onnxruntime]")
+        return False
+    
+    try:
+        source = local_model_path if os.path.exists(local_model_path) else "BAAI/bge-m3"
+        
+        print(f"Exporting {source} to ONNX...")
+        model = ORTModelForFeatureExtraction.from_pretrained(source, export=True)
+        model.save_pretrained(onnx_export_path)
+        
+        print("Applying int8 dynamic quantization (AVX-512 VNNI)...")
+        quantizer = ORTQuantizer.from_pretrained(onnx_export_path)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=onnx_int8_path, quantization_config=qconfig)
+        
+        AutoTokenizer.from_pretrained(source).save_pretrained(onnx_int8_path)
+        
+        print(f"✅ Quantized ONNX model saved to: {os.path.abspath(onnx_int8_path)}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error exporting ONNX model: {e}")
+        return False
+
 if __name__ == "__main__":
+    if "--onnx-int8" in sys.argv:
+        print("🚀 Exporting BGE-M3 to int8 ONNX...")
+        sys.exit(0 if export_onnx_int8_model() else 1)
+    
     print("🚀 Starting BGE-M3 model download...")
     print("=" * 50)
     